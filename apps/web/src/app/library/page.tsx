@@ -14,7 +14,9 @@ export default function LibraryPage() {
     const { user, loading: authLoading, signInWithGoogle } = useAuth();
 
     const [lessons, setLessons] = useState<LessonSummary[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
@@ -27,8 +29,9 @@ export default function LibraryPage() {
 
     const fetchLessons = async () => {
         try {
-            const data = await listLessons();
-            setLessons(data);
+            const page = await listLessons();
+            setLessons(page.lessons);
+            setNextCursor(page.nextCursor ?? null);
         } catch (err) {
             setError(err instanceof Error ? err.message : 'Failed to load lessons');
         } finally {
@@ -36,6 +39,20 @@ export default function LibraryPage() {
         }
     };
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await listLessons(nextCursor);
+            setLessons((prev) => [...prev, ...page.lessons]);
+            setNextCursor(page.nextCursor ?? null);
+        } catch (err) {
+            setError(err instanceof Error ? err.message : 'Failed to load lessons');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const formatDate = (dateString: string) => {
         return new Date(dateString).toLocaleDateString('en-US', {
             year: 'numeric',
@@ -87,7 +104,7 @@ export default function LibraryPage() {
                     <div>
                         <h1 className="text-3xl font-bold text-gray-800">My Lesson Library</h1>
                         <p className="text-gray-600 mt-1">
-                            {lessons.length} lesson{lessons.length !== 1 ? 's' : ''} saved
+                            {lessons.length}{nextCursor ? '+' : ''} lesson{lessons.length !== 1 ? 's' : ''} saved
                         </p>
                     </div>
                     <Link
@@ -165,6 +182,19 @@ export default function LibraryPage() {
                         ))}
                     </div>
                 )}
+
+                {/* Pagination */}
+                {nextCursor && (
+                    <div className="mt-6 text-center">
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="px-6 py-3 bg-white text-emerald-700 border border-emerald-200 rounded-lg font-medium hover:bg-emerald-50 transition-colors disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
@@ -7,8 +7,10 @@ import type {
     GenerateRequest,
     GenerateResponse,
     LessonDocument,
-    LessonSummary,
+    LessonPage,
+    LessonPlan,
     UpdateLessonRequest,
+    BulkWriteResponse,
 } from '@/types';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
@@ -66,6 +68,52 @@ export async function generateLesson(
     return response.json();
 }
 
+/**
+ * Generate a new lesson plan, receiving each section as soon as it is ready
+ * Resolves with the saved lesson once the server has validated and stored it
+ */
+export async function generateLessonStream(
+    request: GenerateRequest,
+    onSection: (key: string, value: unknown) => void
+): Promise<GenerateResponse> {
+    const response = await fetchWithAuth('/api/generate/stream', {
+        method: 'POST',
+        body: JSON.stringify(request),
+    });
+    if (!response.body) {
+        throw new Error('Streaming not supported');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary = buffer.indexOf('\n\n');
+        while (boundary !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf('\n\n');
+
+            const event = message.match(/^event: (.*)$/m)?.[1];
+            const data = JSON.parse(message.match(/^data: (.*)$/m)?.[1] ?? 'null');
+            if (event === 'section') {
+                onSection(data.key, data.value);
+            } else if (event === 'complete') {
+                return { lessonId: data.lessonId, lessonPlan: data.lessonPlan };
+            } else if (event === 'error') {
+                throw new Error(data.detail || 'Generation failed');
+            }
+        }
+    }
+
+    throw new Error('Stream ended before the lesson was saved');
+}
+
 /**
  * Get a lesson by ID
  */
@@ -89,10 +137,15 @@ export async function updateLesson(
 }
 
 /**
- * List all lessons for the current user
+ * List one page of the current user's lessons, newest first.
+ * Pass the previous page's nextCursor to continue.
  */
-export async function listLessons(): Promise<LessonSummary[]> {
-    const response = await fetchWithAuth('/api/lessons');
+export async function listLessons(startAfter?: string, pageSize?: number): Promise<LessonPage> {
+    const params = new URLSearchParams();
+    if (startAfter) params.set('startAfter', startAfter);
+    if (pageSize) params.set('pageSize', String(pageSize));
+    const query = params.toString();
+    const response = await fetchWithAuth(`/api/lessons${query ? `?${query}` : ''}`);
     return response.json();
 }
 
@@ -105,16 +158,54 @@ export async function deleteLesson(lessonId: string): Promise<void> {
     });
 }
 
+/**
+ * Update several lessons in one batch
+ */
+export async function bulkUpdateLessons(
+    lessons: { id: string; lessonPlan: LessonPlan }[]
+): Promise<BulkWriteResponse> {
+    const response = await fetchWithAuth('/api/lessons/bulk-update', {
+        method: 'POST',
+        body: JSON.stringify({ lessons }),
+    });
+    return response.json();
+}
+
+/**
+ * Delete several lessons in one batch
+ */
+export async function bulkDeleteLessons(lessonIds: string[]): Promise<BulkWriteResponse> {
+    const response = await fetchWithAuth('/api/lessons/bulk-delete', {
+        method: 'POST',
+        body: JSON.stringify({ lessonIds }),
+    });
+    return response.json();
+}
+
 // ============== VIDEO API ==============
 
 import type {
+    Slide,
+    VideoJobResponse,
+    VideoJobStatus,
     VideoRequest,
     VideoResponse,
     VideoSummary as VideoSummaryType,
 } from '@/types';
 
+const VIDEO_JOB_POLL_INTERVAL_MS = 2000;
+
+/**
+ * Get the status of a video generation job
+ */
+export async function getVideoJob(jobId: string): Promise<VideoJobStatus> {
+    const response = await fetchWithAuth(`/api/videos/jobs/${jobId}`);
+    return response.json();
+}
+
 /**
  * Generate a new video lesson
+ * Enqueues a job and polls until it finishes
  */
 export async function generateVideo(
     request: VideoRequest
@@ -123,7 +214,37 @@ export async function generateVideo(
         method: 'POST',
         body: JSON.stringify(request),
     });
-    return response.json();
+    const job: VideoJobResponse = await response.json();
+    return waitForVideoJob(job.jobId);
+}
+
+/**
+ * Re-render one slide of an existing video after an edit
+ * Only that slide is regenerated; resolves with the updated video
+ */
+export async function rerenderSlide(
+    videoId: string,
+    slide: Slide
+): Promise<VideoResponse> {
+    const response = await fetchWithAuth(`/api/videos/${videoId}/slides/${slide.slideNumber}`, {
+        method: 'PUT',
+        body: JSON.stringify(slide),
+    });
+    const job: VideoJobResponse = await response.json();
+    return waitForVideoJob(job.jobId);
+}
+
+async function waitForVideoJob(jobId: string): Promise<VideoResponse> {
+    while (true) {
+        await new Promise((resolve) => setTimeout(resolve, VIDEO_JOB_POLL_INTERVAL_MS));
+        const status = await getVideoJob(jobId);
+        if (status.status === 'succeeded' && status.result) {
+            return status.result;
+        }
+        if (status.status === 'failed') {
+            throw new Error(status.error || 'Video generation failed');
+        }
+    }
 }
 
 /**
@@ -49,6 +49,7 @@ export interface GenerateRequest {
     gradeBand: "6-8" | "9-10" | "11-12";
     durationMinutes: 20 | 60;
     topicPrompt: string;
+    bypassCache?: boolean;
 }
 
 export interface GenerateResponse {
@@ -77,10 +78,20 @@ export interface LessonSummary {
     updatedAt: string;
 }
 
+export interface LessonPage {
+    lessons: LessonSummary[];
+    nextCursor?: string | null;
+}
+
 export interface UpdateLessonRequest {
     lessonPlan: LessonPlan;
 }
 
+export interface BulkWriteResponse {
+    succeeded: string[];
+    notFound: string[];
+}
+
 export const REGIONS = [
     "Kenya",
     "Nigeria",
@@ -16,11 +16,14 @@ export interface VideoScript {
     slides: Slide[];
 }
 
+export type EncodingProfile = "draft" | "standard" | "archive";
+
 export interface VideoRequest {
     topic: string;
     gradeBand: "6-8" | "9-10" | "11-12";
     region: string;
     slideCount: number;
+    encodingProfile?: EncodingProfile;
 }
 
 export interface VideoResponse {
@@ -29,6 +32,27 @@ export interface VideoResponse {
     videoUrl: string;
     thumbnailUrl: string;
     durationSeconds: number;
+    hlsUrl?: string;
+    previewUrl?: string;
+}
+
+export type VideoJobState = "queued" | "running" | "succeeded" | "failed";
+
+export interface VideoJobResponse {
+    jobId: string;
+    videoId: string;
+    status: VideoJobState;
+    statusUrl: string;
+}
+
+export interface VideoJobStatus {
+    jobId: string;
+    status: VideoJobState;
+    createdAt: string;
+    startedAt?: string | null;
+    finishedAt?: string | null;
+    result?: VideoResponse | null;
+    error?: string | null;
 }
 
 export interface VideoDocument {
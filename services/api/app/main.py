@@ -14,6 +14,21 @@ load_dotenv()
 
 from .routes.lessons import router as lessons_router
 from .routes.videos import router as videos_router
+from .services.auth import get_token_verifier
+from .services.circuit_breaker import CIRCUIT_OPEN, circuit_states
+from .services.image_generator import get_image_generator
+from .services.job_queue import get_job_queue
+from .services.lesson_cache import get_lesson_cache
+from .services.lesson_document_cache import get_lesson_document_cache
+from .services.media_server import get_media_index
+from .services.provider_governor import governor_stats
+from .services.tts_generator import get_tts_generator
+from .services.video_pipeline import (
+    SLIDE_RERENDER_JOB_KIND,
+    VIDEO_JOB_KIND,
+    run_slide_rerender_job,
+    run_video_job,
+)
 
 
 @asynccontextmanager
@@ -21,9 +36,17 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     print("🚀 Lesson Plan Generator API starting...")
+    get_media_index()
+    job_queue = get_job_queue()
+    job_queue.register_handler(VIDEO_JOB_KIND, run_video_job)
+    job_queue.register_handler(SLIDE_RERENDER_JOB_KIND, run_slide_rerender_job)
+    await job_queue.start()
+    get_token_verifier().start()
     yield
     # Shutdown
     print("👋 Lesson Plan Generator API shutting down...")
+    await get_token_verifier().stop()
+    await job_queue.stop()
 
 
 app = FastAPI(
@@ -60,5 +83,26 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """
+    Health check endpoint. Reports "degraded" while any provider circuit is
+    open; requests are still served, from fallbacks.
+    """
+    circuits = circuit_states()
+    degraded = any(circuit["state"] == CIRCUIT_OPEN for circuit in circuits.values())
+    return {"status": "degraded" if degraded else "healthy", "circuits": circuits}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for background workers and caches."""
+    return {
+        "videoJobs": get_job_queue().stats(),
+        "lessonCache": get_lesson_cache().stats(),
+        "lessonDocuments": get_lesson_document_cache().stats(),
+        "imageCache": get_image_generator().cache_stats(),
+        "imageHedging": get_image_generator().hedging.stats(),
+        "narrationCache": get_tts_generator().cache_stats(),
+        "media": get_media_index().stats(),
+        "authTokens": get_token_verifier().stats(),
+        "providers": governor_stats(),
+    }
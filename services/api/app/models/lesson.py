@@ -61,6 +61,12 @@ class GenerateRequest(BaseModel):
     gradeBand: Literal["6-8", "9-10", "11-12"] = Field(..., description="Target grade band")
     durationMinutes: Literal[20, 60] = Field(..., description="Lesson duration")
     topicPrompt: str = Field(..., min_length=5, max_length=500, description="Topic description")
+    bypassCache: bool = Field(default=False, description="Skip cached plans and generate a fresh one")
+
+
+class BulkGenerateRequest(BaseModel):
+    """Request body for generating a whole unit of lessons."""
+    lessons: List[GenerateRequest] = Field(..., min_length=1, max_length=50)
 
 
 class LessonDocument(BaseModel):
@@ -87,6 +93,29 @@ class UpdateLessonRequest(BaseModel):
     lessonPlan: LessonPlan
 
 
+class LessonUpdate(BaseModel):
+    """One lesson's new content in a bulk update."""
+    id: str
+    lessonPlan: LessonPlan
+
+
+# Firestore batches hold at most 500 writes
+class BulkUpdateRequest(BaseModel):
+    """Request body for updating several lessons in one batch."""
+    lessons: List[LessonUpdate] = Field(..., min_length=1, max_length=500)
+
+
+class BulkDeleteRequest(BaseModel):
+    """Request body for deleting several lessons in one batch."""
+    lessonIds: List[str] = Field(..., min_length=1, max_length=500)
+
+
+class BulkWriteResponse(BaseModel):
+    """Outcome of a bulk update or delete."""
+    succeeded: List[str] = Field(..., description="IDs that were written")
+    notFound: List[str] = Field(..., description="IDs that do not exist or belong to another user")
+
+
 class LessonSummary(BaseModel):
     """Summary of a lesson for library listing."""
     id: str
@@ -95,3 +124,9 @@ class LessonSummary(BaseModel):
     gradeBand: str
     createdAt: datetime
     updatedAt: datetime
+
+
+class LessonPage(BaseModel):
+    """One page of a user's library, newest first."""
+    lessons: List[LessonSummary]
+    nextCursor: Optional[str] = Field(default=None, description="Pass as startAfter to fetch the next page")
@@ -3,7 +3,7 @@ Video Lesson Models
 Pydantic models for video generation requests and responses
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -28,6 +28,10 @@ class VideoRequest(BaseModel):
     gradeBand: str = Field(..., description="Target grade band (3-5, 6-8, 9-12)")
     region: str = Field(..., description="Region for contextual examples")
     slideCount: int = Field(default=5, ge=3, le=8, description="Number of slides (3-8)")
+    encodingProfile: Literal["draft", "standard", "archive"] = Field(
+        default="standard",
+        description="Encode speed/size/quality tradeoff"
+    )
 
 
 class VideoResponse(BaseModel):
@@ -37,6 +41,8 @@ class VideoResponse(BaseModel):
     videoUrl: str
     thumbnailUrl: str
     durationSeconds: float
+    hlsUrl: str = Field(default="", description="HLS playlist for progressive playback, if rendered")
+    previewUrl: str = Field(default="", description="WebVTT index of the seek-preview sprite, if rendered")
 
 
 class VideoDocument(BaseModel):
@@ -63,3 +69,33 @@ class VideoSummary(BaseModel):
     thumbnailUrl: str
     durationSeconds: float
     createdAt: datetime
+
+
+class VideoManifest(BaseModel):
+    """Everything needed to re-render part of a generated video, stored with its artifacts."""
+    videoId: str
+    ownerUid: str
+    request: VideoRequest
+    script: VideoScript
+    durations: List[float] = Field(default_factory=list, description="Seconds per slide, in script order")
+    version: int = 1
+    updatedAt: datetime
+
+
+class VideoJobResponse(BaseModel):
+    """Response after a video generation job is enqueued."""
+    jobId: str
+    videoId: str
+    status: str
+    statusUrl: str
+
+
+class VideoJobStatus(BaseModel):
+    """Current state of a video generation job."""
+    jobId: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    createdAt: datetime
+    startedAt: Optional[datetime] = None
+    finishedAt: Optional[datetime] = None
+    result: Optional[VideoResponse] = None
+    error: Optional[str] = None
@@ -1,15 +1,98 @@
 """
 Firestore Repository for Lesson Plans
-Handles all CRUD operations with user-scoped security
+Handles all CRUD operations with user-scoped security, on the async client
+so Firestore round trips never block the event loop
 """
+import base64
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import uuid
 
-from google.cloud.firestore_v1 import FieldFilter
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP, FieldFilter
 
-from ..services.auth import get_firestore_client
-from ..models.lesson import LessonPlan, LessonDocument, LessonSummary
+from ..services.auth import get_firestore_async_pool
+from ..services.lesson_document_cache import get_lesson_document_cache
+from ..models.lesson import GenerateRequest, LessonPlan, LessonDocument, LessonPage, LessonSummary
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Firestore batches hold at most 500 writes
+MAX_BATCH_SIZE = 500
+
+METADATA_CACHE_SIZE = int(os.getenv("LESSON_METADATA_CACHE_SIZE") or "10000")
+
+# Fields fixed at creation. Caching them lets writes check ownership without
+# reading the document, and lets responses echo them without going stale.
+METADATA_FIELDS = ["ownerUid", "region", "gradeBand", "durationMinutes", "topicPrompt", "createdAt"]
+
+# The only fields a LessonSummary needs; the full plan is never downloaded for listing
+SUMMARY_FIELDS = ["region", "gradeBand", "createdAt", "updatedAt", "title"]
+
+
+def summary_fields(lesson_plan_json: dict) -> dict:
+    """
+    Top-level copies of the plan fields shown in the library. They are
+    written in the same operation as lessonPlanJson so they never drift.
+    """
+    return {"title": lesson_plan_json.get("title") or "Untitled Lesson"}
+
+
+def encode_cursor(created_at: datetime, lesson_id: str) -> str:
+    """Opaque page token for the position just after a lesson."""
+    payload = json.dumps({"createdAt": created_at.isoformat(), "id": lesson_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError for malformed tokens."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return datetime.fromisoformat(payload["createdAt"]), str(payload["id"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page cursor: {e}") from e
+
+
+@dataclass(frozen=True)
+class LessonMetadata:
+    """The immutable part of a lesson document."""
+    owner_uid: str
+    region: str
+    grade_band: str
+    duration_minutes: int
+    topic_prompt: str
+    created_at: datetime
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "LessonMetadata":
+        return cls(
+            owner_uid=data["ownerUid"],
+            region=data["region"],
+            grade_band=data["gradeBand"],
+            duration_minutes=data["durationMinutes"],
+            topic_prompt=data["topicPrompt"],
+            created_at=data["createdAt"]
+        )
+    
+    def document(self, lesson_id: str, updated_at: datetime, lesson_plan: LessonPlan) -> LessonDocument:
+        return LessonDocument(
+            id=lesson_id,
+            ownerUid=self.owner_uid,
+            region=self.region,
+            gradeBand=self.grade_band,
+            durationMinutes=self.duration_minutes,
+            topicPrompt=self.topic_prompt,
+            createdAt=self.created_at,
+            updatedAt=updated_at,
+            lessonPlanJson=lesson_plan
+        )
 
 
 class LessonRepository:
@@ -18,12 +101,66 @@ class LessonRepository:
     COLLECTION = "lessons"
     
     def __init__(self):
-        self.db = get_firestore_client()
+        self.pool = get_firestore_async_pool()
+        # Lesson ID -> metadata, least recently used first. Owners never change
+        # and IDs are never reused, so entries can only go stale by deletion,
+        # which the exists precondition on every write catches.
+        self._metadata: "OrderedDict[str, LessonMetadata]" = OrderedDict()
+        self.documents = get_lesson_document_cache()
     
     def _get_collection(self):
-        return self.db.collection(self.COLLECTION)
+        return self.pool.client().collection(self.COLLECTION)
     
-    async def create(
+    def _remember(self, lesson_id: str, metadata: LessonMetadata):
+        self._metadata[lesson_id] = metadata
+        self._metadata.move_to_end(lesson_id)
+        while len(self._metadata) > METADATA_CACHE_SIZE:
+            self._metadata.popitem(last=False)
+    
+    def _forget(self, lesson_ids: Iterable[str]):
+        """Drop everything cached about deleted lessons."""
+        lesson_ids = list(lesson_ids)
+        for lesson_id in lesson_ids:
+            self._metadata.pop(lesson_id, None)
+        self.documents.invalidate(lesson_ids)
+    
+    async def _load_metadata(self, lesson_ids: List[str]) -> Dict[str, LessonMetadata]:
+        """
+        Metadata for the lessons that exist, from the cache or else one
+        projected read of the misses (never the lesson plan itself).
+        """
+        found = {}
+        misses = []
+        for lesson_id in lesson_ids:
+            cached = self._metadata.get(lesson_id)
+            if cached is None:
+                misses.append(lesson_id)
+            else:
+                self._metadata.move_to_end(lesson_id)
+                found[lesson_id] = cached
+        
+        if misses:
+            client = self.pool.client()
+            collection = client.collection(self.COLLECTION)
+            refs = [collection.document(lesson_id) for lesson_id in misses]
+            async for doc in client.get_all(refs, field_paths=METADATA_FIELDS):
+                if doc.exists:
+                    found[doc.id] = LessonMetadata.from_dict(doc.to_dict())
+                    self._remember(doc.id, found[doc.id])
+        
+        return found
+    
+    async def _owned(self, lesson_ids: Iterable[str], owner_uid: str) -> Dict[str, LessonMetadata]:
+        """The subset of lesson_ids that exist and belong to owner_uid, in order."""
+        unique_ids = list(dict.fromkeys(lesson_ids))
+        metadata = await self._load_metadata(unique_ids)
+        return {
+            lesson_id: metadata[lesson_id]
+            for lesson_id in unique_ids
+            if lesson_id in metadata and metadata[lesson_id].owner_uid == owner_uid
+        }
+    
+    def _new_lesson(
         self,
         owner_uid: str,
         region: str,
@@ -31,60 +168,99 @@ class LessonRepository:
         duration_minutes: int,
         topic_prompt: str,
         lesson_plan: LessonPlan
-    ) -> LessonDocument:
-        """Create a new lesson document."""
-        lesson_id = str(uuid.uuid4())
-        now = datetime.utcnow()
-        
-        doc_data = {
+    ) -> dict:
+        plan_json = lesson_plan.model_dump()
+        return {
             "ownerUid": owner_uid,
             "region": region,
             "gradeBand": grade_band,
             "durationMinutes": duration_minutes,
             "topicPrompt": topic_prompt,
-            "createdAt": now,
-            "updatedAt": now,
-            "lessonPlanJson": lesson_plan.model_dump()
+            "createdAt": SERVER_TIMESTAMP,
+            "updatedAt": SERVER_TIMESTAMP,
+            "lessonPlanJson": plan_json,
+            **summary_fields(plan_json)
         }
+    
+    def _created(self, lesson_id: str, doc_data: dict, lesson_plan: LessonPlan, update_time: datetime) -> LessonDocument:
+        # Server timestamps resolve to the commit time
+        metadata = LessonMetadata.from_dict({**doc_data, "createdAt": update_time})
+        self._remember(lesson_id, metadata)
+        document = metadata.document(lesson_id, update_time, lesson_plan)
+        # Generated lessons are usually opened straight away
+        self.documents.put(document)
+        return document
+    
+    async def create(
+        self,
+        owner_uid: str,
+        region: str,
+        grade_band: str,
+        duration_minutes: int,
+        topic_prompt: str,
+        lesson_plan: LessonPlan
+    ) -> LessonDocument:
+        """Create a new lesson document."""
+        lesson_id = str(uuid.uuid4())
+        doc_data = self._new_lesson(owner_uid, region, grade_band, duration_minutes, topic_prompt, lesson_plan)
         
-        self._get_collection().document(lesson_id).set(doc_data)
-        
-        return LessonDocument(
-            id=lesson_id,
-            ownerUid=owner_uid,
-            region=region,
-            gradeBand=grade_band,
-            durationMinutes=duration_minutes,
-            topicPrompt=topic_prompt,
-            createdAt=now,
-            updatedAt=now,
-            lessonPlanJson=lesson_plan
-        )
+        result = await self._get_collection().document(lesson_id).create(doc_data)
+        return self._created(lesson_id, doc_data, lesson_plan, result.update_time)
+    
+    async def create_many(
+        self,
+        owner_uid: str,
+        lessons: List[Tuple[GenerateRequest, LessonPlan]]
+    ) -> List[LessonDocument]:
+        """
+        Create lessons for generated plans with batched commits (one per
+        MAX_BATCH_SIZE lessons). Returns the documents in input order.
+        """
+        client = self.pool.client()
+        documents = []
+        for start in range(0, len(lessons), MAX_BATCH_SIZE):
+            batch = client.batch()
+            created = []
+            for request, lesson_plan in lessons[start:start + MAX_BATCH_SIZE]:
+                lesson_id = str(uuid.uuid4())
+                doc_data = self._new_lesson(
+                    owner_uid, request.region, request.gradeBand, request.durationMinutes,
+                    request.topicPrompt, lesson_plan
+                )
+                batch.create(client.collection(self.COLLECTION).document(lesson_id), doc_data)
+                created.append((lesson_id, doc_data, lesson_plan))
+            
+            results = await batch.commit()
+            documents.extend(
+                self._created(lesson_id, doc_data, lesson_plan, result.update_time)
+                for (lesson_id, doc_data, lesson_plan), result in zip(created, results)
+            )
+        return documents
     
     async def get_by_id(self, lesson_id: str, owner_uid: str) -> Optional[LessonDocument]:
         """Get a lesson by ID, ensuring owner matches."""
-        doc = self._get_collection().document(lesson_id).get()
+        cached = self.documents.get(lesson_id, owner_uid)
+        if cached is not None:
+            return cached
+        
+        # A delete that lands while this read is in flight must win over it
+        read_at = time.time()
+        doc = await self._get_collection().document(lesson_id).get()
         
         if not doc.exists:
             return None
         
         data = doc.to_dict()
+        metadata = LessonMetadata.from_dict(data)
+        self._remember(doc.id, metadata)
         
         # Security check: only owner can access
-        if data.get("ownerUid") != owner_uid:
+        if metadata.owner_uid != owner_uid:
             return None
         
-        return LessonDocument(
-            id=doc.id,
-            ownerUid=data["ownerUid"],
-            region=data["region"],
-            gradeBand=data["gradeBand"],
-            durationMinutes=data["durationMinutes"],
-            topicPrompt=data["topicPrompt"],
-            createdAt=data["createdAt"],
-            updatedAt=data["updatedAt"],
-            lessonPlanJson=LessonPlan(**data["lessonPlanJson"])
-        )
+        document = metadata.document(doc.id, data["updatedAt"], LessonPlan(**data["lessonPlanJson"]))
+        self.documents.put(document, read_at)
+        return document
     
     async def update(
         self,
@@ -92,78 +268,161 @@ class LessonRepository:
         owner_uid: str,
         lesson_plan: LessonPlan
     ) -> Optional[LessonDocument]:
-        """Update a lesson's plan content."""
-        doc_ref = self._get_collection().document(lesson_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
-            return None
-        
-        data = doc.to_dict()
-        
+        """
+        Update a lesson's plan content. Ownership is checked against the
+        cached metadata, so a warm update is a single write.
+        """
         # Security check: only owner can update
-        if data.get("ownerUid") != owner_uid:
+        owned = await self._owned([lesson_id], owner_uid)
+        if lesson_id not in owned:
             return None
         
-        now = datetime.utcnow()
-        
-        doc_ref.update({
-            "lessonPlanJson": lesson_plan.model_dump(),
-            "updatedAt": now
-        })
+        plan_json = lesson_plan.model_dump()
+        try:
+            # update() carries an exists precondition
+            result = await self._get_collection().document(lesson_id).update({
+                "lessonPlanJson": plan_json,
+                **summary_fields(plan_json),
+                "updatedAt": SERVER_TIMESTAMP
+            })
+        except NotFound:
+            self._forget([lesson_id])
+            return None
         
-        return LessonDocument(
-            id=doc.id,
-            ownerUid=data["ownerUid"],
-            region=data["region"],
-            gradeBand=data["gradeBand"],
-            durationMinutes=data["durationMinutes"],
-            topicPrompt=data["topicPrompt"],
-            createdAt=data["createdAt"],
-            updatedAt=now,
-            lessonPlanJson=lesson_plan
-        )
+        # Replaces the cached copy, so the editor's next read is a hit
+        document = owned[lesson_id].document(lesson_id, result.update_time, lesson_plan)
+        self.documents.put(document)
+        return document
     
-    async def list_by_owner(self, owner_uid: str) -> List[LessonSummary]:
-        """List all lessons owned by a user."""
-        query = self._get_collection().where(
-            filter=FieldFilter("ownerUid", "==", owner_uid)
-        ).order_by("createdAt", direction="DESCENDING")
-        
-        docs = query.stream()
+    async def bulk_update(
+        self,
+        owner_uid: str,
+        lesson_plans: Dict[str, LessonPlan]
+    ) -> List[str]:
+        """
+        Update several of the owner's lessons in one batched commit.
+        Returns the IDs that were written; the rest do not exist or are not
+        the owner's.
+        """
+        for attempt in range(2):
+            owned = await self._owned(lesson_plans, owner_uid)
+            if not owned:
+                return []
+            
+            client = self.pool.client()
+            batch = client.batch()
+            for lesson_id in owned:
+                plan_json = lesson_plans[lesson_id].model_dump()
+                batch.update(client.collection(self.COLLECTION).document(lesson_id), {
+                    "lessonPlanJson": plan_json,
+                    **summary_fields(plan_json),
+                    "updatedAt": SERVER_TIMESTAMP
+                })
+            try:
+                await batch.commit()
+                self.documents.invalidate(owned)
+                return list(owned)
+            except NotFound:
+                # A lesson was deleted concurrently and the batch failed as a
+                # whole; re-check every ID against Firestore and retry once
+                self._forget(owned)
+                if attempt:
+                    raise
+    
+    async def list_by_owner(
+        self,
+        owner_uid: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        start_after: Optional[Tuple[datetime, str]] = None
+    ) -> LessonPage:
+        """
+        List one page of a user's lessons, newest first. Only the small
+        top-level summary fields are fetched, and the query reads at most
+        page_size + 1 documents, so cost stays flat as a library grows.
+        Lessons written before the summary fields existed need
+        backfill_lesson_summaries.py. start_after is a position from
+        decode_cursor.
+        """
+        # Document ID breaks createdAt ties so cursors never skip or repeat
+        query = (
+            self._get_collection()
+            .where(filter=FieldFilter("ownerUid", "==", owner_uid))
+            .order_by("createdAt", direction="DESCENDING")
+            .order_by("__name__", direction="DESCENDING")
+            .select(SUMMARY_FIELDS)
+            .limit(page_size + 1)
+        )
+        if start_after:
+            created_at, lesson_id = start_after
+            query = query.start_after({"createdAt": created_at, "__name__": lesson_id})
         
         summaries = []
-        for doc in docs:
+        async for doc in query.stream():
             data = doc.to_dict()
-            lesson_plan = data.get("lessonPlanJson", {})
             
             summaries.append(LessonSummary(
                 id=doc.id,
-                title=lesson_plan.get("title", "Untitled Lesson"),
+                title=data.get("title", "Untitled Lesson"),
                 region=data.get("region", ""),
                 gradeBand=data.get("gradeBand", ""),
                 createdAt=data.get("createdAt"),
                 updatedAt=data.get("updatedAt")
             ))
         
-        return summaries
+        next_cursor = None
+        if len(summaries) > page_size:
+            summaries = summaries[:page_size]
+            last = summaries[-1]
+            next_cursor = encode_cursor(last.createdAt, last.id)
+        
+        return LessonPage(lessons=summaries, nextCursor=next_cursor)
     
     async def delete(self, lesson_id: str, owner_uid: str) -> bool:
-        """Delete a lesson (for future use)."""
-        doc_ref = self._get_collection().document(lesson_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
-            return False
-        
-        data = doc.to_dict()
-        
+        """Delete a lesson, checking ownership against the cached metadata."""
         # Security check: only owner can delete
-        if data.get("ownerUid") != owner_uid:
+        owned = await self._owned([lesson_id], owner_uid)
+        if lesson_id not in owned:
             return False
         
-        doc_ref.delete()
+        try:
+            await self._get_collection().document(lesson_id).delete(
+                option=self.pool.client().write_option(exists=True)
+            )
+        except NotFound:
+            return False
+        finally:
+            self._forget([lesson_id])
         return True
+    
+    async def bulk_delete(self, owner_uid: str, lesson_ids: List[str]) -> List[str]:
+        """
+        Delete several of the owner's lessons in one batched commit.
+        Returns the IDs that were deleted; the rest do not exist or are not
+        the owner's.
+        """
+        for attempt in range(2):
+            owned = await self._owned(lesson_ids, owner_uid)
+            if not owned:
+                return []
+            
+            client = self.pool.client()
+            batch = client.batch()
+            for lesson_id in owned:
+                # Precondition, as in delete(): a lesson already gone is not reported as deleted
+                batch.delete(
+                    client.collection(self.COLLECTION).document(lesson_id),
+                    option=client.write_option(exists=True)
+                )
+            try:
+                await batch.commit()
+                return list(owned)
+            except NotFound:
+                # A lesson was deleted concurrently and the batch failed as a
+                # whole; re-check every ID against Firestore and retry once
+                if attempt:
+                    raise
+            finally:
+                self._forget(owned)
 
 
 # Singleton instance
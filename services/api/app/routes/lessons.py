@@ -1,28 +1,48 @@
 """
 Lesson Plan API Routes
 POST /generate - Generate a new lesson plan
+POST /generate/stream - Generate a lesson plan, streaming sections as SSE
+POST /generate/bulk - Generate several lesson plans, streaming results as SSE
 GET /lessons/{lessonId} - Get a lesson by ID
 PUT /lessons/{lessonId} - Update a lesson
-GET /lessons - List all lessons for user
+GET /lessons - List the user's lessons, one page at a time
+POST /lessons/bulk-update - Update several lessons in one batch
+POST /lessons/bulk-delete - Delete several lessons in one batch
 """
-from typing import List
+import json
+import os
+from typing import Any, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from ..models.lesson import (
+    BulkDeleteRequest,
+    BulkGenerateRequest,
+    BulkUpdateRequest,
+    BulkWriteResponse,
     GenerateRequest,
     GenerateResponse,
     LessonDocument,
-    LessonSummary,
+    LessonPage,
+    LessonPlan,
     UpdateLessonRequest,
 )
 from ..services.auth import verify_firebase_token
 from ..services.generator import get_lesson_generator
-from ..repositories.firestore import get_lesson_repository
+from ..repositories.firestore import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    get_lesson_repository,
+)
 
 
 router = APIRouter()
 
+# Generated plans saved together in one batched write during bulk generation
+BULK_SAVE_BATCH_SIZE = int(os.getenv("BULK_SAVE_BATCH_SIZE") or "10")
+
 
 @router.post("/generate", response_model=GenerateResponse)
 async def generate_lesson(
@@ -52,13 +72,174 @@ async def generate_lesson(
     )
 
 
-@router.get("/lessons", response_model=List[LessonSummary])
+def _sse(event: str, data: Any) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_lesson_stream(
+    request: GenerateRequest,
+    user_id: str = Depends(verify_firebase_token)
+):
+    """
+    Generate a new lesson plan, streaming it as Server-Sent Events.
+    
+    Events:
+    - section: {"key": ..., "value": ...} for each completed top-level field
+    - complete: {"lessonId": ..., "lessonPlan": ...} once validated and saved
+    - error: {"detail": ...} if the plan could not be saved
+    """
+    generator = get_lesson_generator()
+    repo = get_lesson_repository()
+    
+    async def event_stream():
+        async for event in generator.generate_stream(request):
+            if event.plan is None:
+                yield _sse("section", {"key": event.section, "value": event.value})
+                continue
+            
+            try:
+                doc = await repo.create(
+                    owner_uid=user_id,
+                    region=request.region,
+                    grade_band=request.gradeBand,
+                    duration_minutes=request.durationMinutes,
+                    topic_prompt=request.topicPrompt,
+                    lesson_plan=event.plan
+                )
+            except Exception as e:
+                print(f"Failed to save streamed lesson: {e}")
+                yield _sse("error", {"detail": "Failed to save lesson"})
+                return
+            
+            yield _sse("complete", {
+                "lessonId": doc.id,
+                "lessonPlan": event.plan.model_dump()
+            })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/bulk")
+async def generate_lessons_bulk(
+    request: BulkGenerateRequest,
+    user_id: str = Depends(verify_firebase_token)
+):
+    """
+    Generate several lesson plans, at most BULK_GENERATE_CONCURRENCY at a
+    time, streaming results as Server-Sent Events in completion order.
+    
+    Events:
+    - lesson: {"index": ..., "lessonPlan": ...} as each plan is generated
+    - saved: {"lessons": [{"index": ..., "lessonId": ...}]} after each batched write
+    - error: {"index": ..., "detail": ...} for an item that could not be generated or saved
+    - complete: {"saved": ..., "failed": ...} once every item is done
+    """
+    generator = get_lesson_generator()
+    repo = get_lesson_repository()
+    items = request.lessons
+    
+    async def event_stream():
+        pending: List[Tuple[int, LessonPlan]] = []
+        counts = {"saved": 0, "failed": 0}
+        
+        async def flush() -> List[str]:
+            batch = pending[:]
+            pending.clear()
+            try:
+                docs = await repo.create_many(user_id, [(items[index], plan) for index, plan in batch])
+            except Exception as e:
+                print(f"Failed to save bulk lessons: {e}")
+                counts["failed"] += len(batch)
+                return [_sse("error", {"index": index, "detail": "Failed to save lesson"}) for index, _ in batch]
+            
+            counts["saved"] += len(docs)
+            return [_sse("saved", {
+                "lessons": [{"index": index, "lessonId": doc.id} for (index, _), doc in zip(batch, docs)]
+            })]
+        
+        # Generation keeps running in the background while a batch is written
+        async for index, plan in generator.generate_many(items):
+            if plan is None:
+                counts["failed"] += 1
+                yield _sse("error", {"index": index, "detail": "Failed to generate lesson"})
+                continue
+            
+            yield _sse("lesson", {"index": index, "lessonPlan": plan.model_dump()})
+            pending.append((index, plan))
+            if len(pending) >= BULK_SAVE_BATCH_SIZE:
+                for event in await flush():
+                    yield event
+        
+        if pending:
+            for event in await flush():
+                yield event
+        yield _sse("complete", counts)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/lessons", response_model=LessonPage)
 async def list_lessons(
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, alias="pageSize"),
+    start_after: Optional[str] = Query(None, alias="startAfter"),
+    user_id: str = Depends(verify_firebase_token)
+):
+    """
+    List the authenticated user's lessons, newest first.
+    Pass the returned nextCursor as startAfter to get the next page.
+    """
+    # Only a malformed cursor is the client's fault; anything else is a 500
+    cursor = None
+    if start_after:
+        try:
+            cursor = decode_cursor(start_after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid startAfter cursor")
+    
+    repo = get_lesson_repository()
+    return await repo.list_by_owner(user_id, page_size, cursor)
+
+
+@router.post("/lessons/bulk-update", response_model=BulkWriteResponse)
+async def bulk_update_lessons(
+    request: BulkUpdateRequest,
+    user_id: str = Depends(verify_firebase_token)
+):
+    """Update several of the user's lessons in one atomic batch."""
+    repo = get_lesson_repository()
+    lesson_plans = {lesson.id: lesson.lessonPlan for lesson in request.lessons}
+    succeeded = await repo.bulk_update(user_id, lesson_plans)
+    
+    return BulkWriteResponse(
+        succeeded=succeeded,
+        notFound=[lesson_id for lesson_id in lesson_plans if lesson_id not in succeeded]
+    )
+
+
+@router.post("/lessons/bulk-delete", response_model=BulkWriteResponse)
+async def bulk_delete_lessons(
+    request: BulkDeleteRequest,
     user_id: str = Depends(verify_firebase_token)
 ):
-    """List all lessons for the authenticated user."""
+    """Delete several of the user's lessons in one atomic batch."""
     repo = get_lesson_repository()
-    return await repo.list_by_owner(user_id)
+    lesson_ids = list(dict.fromkeys(request.lessonIds))
+    succeeded = await repo.bulk_delete(user_id, lesson_ids)
+    
+    return BulkWriteResponse(
+        succeeded=succeeded,
+        notFound=[lesson_id for lesson_id in lesson_ids if lesson_id not in succeeded]
+    )
 
 
 @router.get("/lessons/{lesson_id}", response_model=LessonDocument)
@@ -1,112 +1,157 @@
 """
 Video Lesson API Routes
-POST /generate-video - Generate a new video lesson
+POST /generate-video - Enqueue a new video lesson job
+GET /videos/jobs/{jobId} - Get video job status
 GET /videos - List all videos for user
 GET /videos/{videoId} - Get a video by ID
 GET /videos/{videoId}/stream - Stream/download video file
+GET /videos/{videoId}/hls/{file} - HLS playlist and segments
+GET /videos/{videoId}/previews/{file} - Poster frames and seek-preview sprite
+PUT /videos/{videoId}/slides/{n} - Re-render one edited slide
 """
 from typing import List
 import uuid
-import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from ..models.video import (
+    Slide,
+    VideoJobResponse,
+    VideoJobStatus,
     VideoRequest,
     VideoResponse,
-    VideoScript,
     VideoSummary,
 )
 from ..services.auth import verify_firebase_token
-from ..services.video_generator import get_video_script_generator
-from ..services.image_generator import get_image_generator
-from ..services.tts_generator import get_tts_generator
-from ..services.video_assembler import get_video_assembler, SlideAssets
+from ..services.job_queue import get_job_queue, QueueFullError
+from ..services.media_server import MediaResponse, get_media_index
+from ..services.video_assembler import HLS_PLAYLIST
+from ..services.video_pipeline import SLIDE_RERENDER_JOB_KIND, VIDEO_JOB_KIND
+from ..services.video_store import get_video_store
 
 
 router = APIRouter()
 
+HLS_SEGMENT_NAME = re.compile(r"^seg_[0-9a-f]+_\d+\.ts$")
+PREVIEW_NAME = re.compile(r"^(poster_\d+\.(webp|jpg)|sprite\.(jpg|vtt))$")
 
-@router.post("/generate-video", response_model=VideoResponse)
+
+@router.post("/generate-video", response_model=VideoJobResponse, status_code=202)
 async def generate_video(
     request: VideoRequest,
     user_id: str = Depends(verify_firebase_token)
 ):
     """
-    Generate a video lesson from the given topic.
-    
-    Pipeline:
-    1. Generate script via Gemini
-    2. Generate images via NanoBanana (parallel)
-    3. Generate TTS audio via ElevenLabs (parallel)
-    4. Assemble video via FFmpeg
+    Enqueue a video lesson generation job.
+    Poll GET /videos/jobs/{jobId} for progress and the final video.
     """
     video_id = str(uuid.uuid4())
+    queue = get_job_queue()
     
-    # Step 1: Generate script
-    print(f"[VIDEO] Starting video generation for topic: {request.topic}")
-    script_generator = get_video_script_generator()
-    script = await script_generator.generate_script(request)
-    print(f"[VIDEO] Script generated: {script.title} with {len(script.slides)} slides")
-    
-    # Step 2 & 3: Generate images and audio in parallel
-    image_generator = get_image_generator()
-    tts_generator = get_tts_generator()
-    
-    # Extract prompts and narrations
-    image_prompts = [slide.imagePrompt for slide in script.slides]
-    narration_texts = [slide.narration for slide in script.slides]
-    
-    print(f"[VIDEO] Generating {len(image_prompts)} images and {len(narration_texts)} audio clips...")
-    
-    # Generate in parallel
-    import asyncio
-    images_task = image_generator.generate_slide_images(image_prompts)
-    audio_task = tts_generator.generate_slide_narrations(narration_texts)
-    
-    images, audio_results = await asyncio.gather(images_task, audio_task)
-    
-    # Log results
-    images_success = sum(1 for img in images if img is not None)
-    audio_success = sum(1 for aud, _ in audio_results if aud is not None)
-    print(f"[VIDEO] Images generated: {images_success}/{len(images)}")
-    print(f"[VIDEO] Audio clips generated: {audio_success}/{len(audio_results)}")
-    
-    # Step 4: Assemble video
-    slides = []
-    total_duration = 0.0
+    try:
+        job = await queue.submit(
+            VIDEO_JOB_KIND,
+            owner_uid=user_id,
+            payload={"videoId": video_id, "ownerUid": user_id, "request": request.model_dump()}
+        )
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="Video queue is full, please retry shortly")
     
-    for i, slide in enumerate(script.slides):
-        audio_bytes, duration = audio_results[i] if i < len(audio_results) else (None, 5.0)
-        slides.append(SlideAssets(
-            slide_number=slide.slideNumber,
-            image_bytes=images[i] if i < len(images) else None,
-            audio_bytes=audio_bytes,
-            duration_seconds=duration if duration > 0 else 5.0
-        ))
-        total_duration += duration if duration > 0 else 5.0
+    print(f"[VIDEO] Enqueued job {job.id} for video {video_id}")
     
-    # Assemble the video
-    assembler = get_video_assembler()
-    video_path = await assembler.assemble_video(slides, f"{video_id}.mp4")
-    
-    print(f"[VIDEO] Assembly result: {video_path}")
-    
-    # TODO: Upload to Firebase Storage and get public URL
-    # For now, return local path
-    video_url = f"/output/{video_id}.mp4" if video_path else ""
-    thumbnail_url = ""  # TODO: Generate thumbnail from first frame
-    
-    # TODO: Save to Firestore
+    return VideoJobResponse(
+        jobId=job.id,
+        videoId=video_id,
+        status=job.status,
+        statusUrl=f"/api/videos/jobs/{job.id}"
+    )
+
+
+@router.get("/videos/jobs/{job_id}", response_model=VideoJobStatus)
+async def get_video_job(
+    job_id: str,
+    user_id: str = Depends(verify_firebase_token)
+):
+    """Get the status of a video generation job."""
+    job = await get_job_queue().get_job(job_id)
+    
+    if not job or job.owner_uid != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return VideoJobStatus(
+        jobId=job.id,
+        status=job.status,
+        createdAt=datetime.fromtimestamp(job.created_at, tz=timezone.utc),
+        startedAt=datetime.fromtimestamp(job.started_at, tz=timezone.utc) if job.started_at else None,
+        finishedAt=datetime.fromtimestamp(job.finished_at, tz=timezone.utc) if job.finished_at else None,
+        result=VideoResponse(**job.result) if job.result else None,
+        error=job.error
+    )
+
+
+@router.api_route("/videos/{video_id}/previews/{filename}", methods=["GET", "HEAD"])
+async def get_video_preview(video_id: str, filename: str, request: Request):
+    """
+    Serve poster frames, the seek-preview sprite and its WebVTT index.
+    URLs handed out by the API carry a ?v= version and are cached as
+    immutable; unversioned requests revalidate against the ETag.
+    """
+    if not PREVIEW_NAME.match(filename):
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    media_index = get_media_index()
+    entry = media_index.lookup(f"{video_id}/previews/{filename}")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    if "v" in request.query_params:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "no-cache"
+    return MediaResponse(media_index, entry, headers={"Cache-Control": cache_control})
+
+
+@router.put("/videos/{video_id}/slides/{slide_number}", response_model=VideoJobResponse, status_code=202)
+async def rerender_video_slide(
+    video_id: str,
+    slide_number: int,
+    slide: Slide,
+    user_id: str = Depends(verify_firebase_token)
+):
+    """
+    Replace one slide of a generated video and re-render only that slide.
+    Poll GET /videos/jobs/{jobId} for the updated video.
+    """
+    try:
+        uuid.UUID(video_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Video not found")
     
-    return VideoResponse(
+    manifest = get_video_store().load_manifest(video_id)
+    if not manifest or manifest.ownerUid != user_id:
+        raise HTTPException(status_code=404, detail="Video not found")
+    if all(existing.slideNumber != slide_number for existing in manifest.script.slides):
+        raise HTTPException(status_code=404, detail="Slide not found")
+    
+    slide = slide.model_copy(update={"slideNumber": slide_number})
+    try:
+        job = await get_job_queue().submit(
+            SLIDE_RERENDER_JOB_KIND,
+            owner_uid=user_id,
+            payload={"videoId": video_id, "slide": slide.model_dump()}
+        )
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="Video queue is full, please retry shortly")
+    
+    print(f"[VIDEO] Enqueued re-render job {job.id} for slide {slide_number} of {video_id}")
+    
+    return VideoJobResponse(
+        jobId=job.id,
         videoId=video_id,
-        title=script.title,
-        videoUrl=video_url,
-        thumbnailUrl=thumbnail_url,
-        durationSeconds=total_duration
+        status=job.status,
+        statusUrl=f"/api/videos/jobs/{job.id}"
     )
 
 
@@ -129,21 +174,44 @@ async def get_video(
     raise HTTPException(status_code=404, detail="Video not found")
 
 
-@router.get("/videos/{video_id}/stream")
+@router.api_route("/videos/{video_id}/stream", methods=["GET", "HEAD"])
 async def stream_video(video_id: str):
     """
-    Stream or download a video file.
+    Stream or download a video file, with Range support for seeking.
     No auth required for direct video access (video ID is the security).
     """
-    # Look for video in output directory
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "output")
-    video_path = os.path.join(output_dir, f"{video_id}.mp4")
+    media_index = get_media_index()
+    entry = media_index.lookup(f"{video_id}.mp4")
     
-    if not os.path.exists(video_path):
+    if entry is None:
         raise HTTPException(status_code=404, detail="Video not found")
     
-    return FileResponse(
-        video_path,
-        media_type="video/mp4",
+    # Re-renders replace the file, so clients revalidate against the ETag
+    return MediaResponse(
+        media_index,
+        entry,
+        headers={"Cache-Control": "no-cache"},
         filename=f"lesson_{video_id}.mp4"
     )
+
+
+@router.api_route("/videos/{video_id}/hls/{filename}", methods=["GET", "HEAD"])
+async def stream_video_hls(video_id: str, filename: str):
+    """
+    Serve the HLS rendition so players can start after the first segment.
+    Same access model as /stream. Segment names are unique per render, so
+    segments are cacheable indefinitely; the playlist is revalidated.
+    """
+    if filename != HLS_PLAYLIST and not HLS_SEGMENT_NAME.match(filename):
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    media_index = get_media_index()
+    entry = media_index.lookup(f"{video_id}/hls/{filename}")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    if filename == HLS_PLAYLIST:
+        cache_control = "no-cache"
+    else:
+        cache_control = "public, max-age=31536000, immutable"
+    return MediaResponse(media_index, entry, headers={"Cache-Control": cache_control})
@@ -1,12 +1,14 @@
 """
 Services package
 """
-from .auth import verify_firebase_token, get_firestore_client, CurrentUser
+from .auth import verify_firebase_token, get_firestore_client, get_firestore_async_pool, get_token_verifier, CurrentUser
 from .generator import get_lesson_generator, LessonGenerator
 
 __all__ = [
     "verify_firebase_token",
     "get_firestore_client",
+    "get_firestore_async_pool",
+    "get_token_verifier",
     "CurrentUser",
     "get_lesson_generator",
     "LessonGenerator",
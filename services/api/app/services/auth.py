@@ -2,13 +2,19 @@
 Firebase Authentication Service
 Initializes Firebase Admin SDK and provides token verification
 """
+import asyncio
+import hashlib
+import itertools
 import os
+import time
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional
 
 import firebase_admin
 from firebase_admin import auth, credentials, firestore
 from fastapi import Depends, HTTPException, Header
+from google.cloud.firestore import AsyncClient
 
 
 @lru_cache()
@@ -42,6 +48,152 @@ def get_firestore_client():
     return firestore.client()
 
 
+def _new_async_client() -> AsyncClient:
+    if os.getenv("FIRESTORE_EMULATOR_HOST"):
+        # The emulator accepts any project and needs no credentials
+        return AsyncClient(project=os.getenv("FIREBASE_PROJECT_ID") or "demo-lesson-planner")
+    app = get_firebase_app()
+    return AsyncClient(project=app.project_id, credentials=app.credential.get_credential())
+
+
+class AsyncFirestorePool:
+    """
+    Round-robins requests over several AsyncClients. Each client owns one
+    gRPC channel (one HTTP/2 connection with a cap on concurrent streams),
+    so bursts of requests spread over the pool instead of queueing on a
+    single connection.
+    """
+    
+    def __init__(self, size: int):
+        self.clients: List[AsyncClient] = [_new_async_client() for _ in range(size)]
+        self._next = itertools.cycle(self.clients)
+    
+    def client(self) -> AsyncClient:
+        return next(self._next)
+
+
+@lru_cache()
+def get_firestore_async_pool() -> AsyncFirestorePool:
+    """Get the shared pool of async Firestore clients."""
+    return AsyncFirestorePool(max(1, int(os.getenv("FIRESTORE_CHANNEL_POOL_SIZE") or "4")))
+
+
+class TokenVerifier:
+    """
+    Verifies Firebase ID tokens off the event loop and remembers the result.
+    Decoded tokens are cached by SHA-256 of the token until their exp claim,
+    concurrent verifications of the same token share one thread-pool call,
+    and Google's signing certificates are re-fetched in the background
+    before the SDK's HTTP cache lets them lapse.
+    """
+    
+    def __init__(self, max_entries: int, cert_refresh_seconds: float):
+        self.max_entries = max_entries
+        self.cert_refresh_seconds = cert_refresh_seconds
+        # Token hash -> (uid, exp), least recently used first
+        self._tokens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.cert_refreshes = 0
+    
+    async def verify(self, token: str) -> str:
+        """Return the token's uid. Raises the firebase_admin.auth errors."""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        cached = self._tokens.get(key)
+        if cached is not None:
+            uid, exp = cached
+            if exp > time.time():
+                self._tokens.move_to_end(key)
+                self.hits += 1
+                return uid
+            del self._tokens[key]
+        
+        self.misses += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(asyncio.to_thread(self._verify_sync, token))
+            future.add_done_callback(lambda done: self._store(key, done))
+            self._in_flight[key] = future
+        # Shielded so a disconnecting client doesn't cancel a shared verification
+        decoded = await asyncio.shield(future)
+        return decoded["uid"]
+    
+    def _store(self, key: str, future: asyncio.Future):
+        del self._in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        decoded = future.result()
+        self._tokens[key] = (decoded["uid"], decoded["exp"])
+        while len(self._tokens) > self.max_entries:
+            self._tokens.popitem(last=False)
+    
+    def _verify_sync(self, token: str) -> dict:
+        return auth.verify_id_token(token, app=get_firebase_app())
+    
+    def _refresh_certs_sync(self) -> bool:
+        """Re-fetch the signing certificates. False if this SDK version can't."""
+        app = get_firebase_app()
+        # The SDK fetches certificates through a Cache-Control-aware session;
+        # a no-cache request replaces the cached copy with a fresh one. That
+        # session is private, so if a firebase-admin release moves it only
+        # the refresh is lost, never verification itself.
+        try:
+            from firebase_admin._token_gen import ID_TOKEN_CERT_URI
+            request = auth._get_client(app)._token_verifier.request
+        except (ImportError, AttributeError) as e:
+            print(f"[AUTH] Signing certificate refresh disabled, unsupported firebase-admin: {e}")
+            return False
+        response = request(ID_TOKEN_CERT_URI, headers={"Cache-Control": "no-cache"})
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        return True
+    
+    async def _refresh_certs(self):
+        while True:
+            try:
+                if not await asyncio.to_thread(self._refresh_certs_sync):
+                    return
+                self.cert_refreshes += 1
+            except Exception as e:
+                print(f"[AUTH] Signing certificate refresh failed: {e}")
+            await asyncio.sleep(self.cert_refresh_seconds)
+    
+    def start(self):
+        """Start refreshing signing certificates in the background."""
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_certs())
+    
+    async def stop(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._tokens),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "certRefreshes": self.cert_refreshes,
+        }
+
+
+@lru_cache()
+def get_token_verifier() -> TokenVerifier:
+    """Get the shared ID token verifier."""
+    return TokenVerifier(
+        max_entries=int(os.getenv("AUTH_TOKEN_CACHE_SIZE") or "10000"),
+        cert_refresh_seconds=float(os.getenv("AUTH_CERT_REFRESH_SECONDS") or "3600")
+    )
+
+
 async def verify_firebase_token(authorization: Optional[str] = Header(None)) -> str:
     """
     Dependency to verify Firebase ID token from Authorization header.
@@ -56,9 +208,7 @@ async def verify_firebase_token(authorization: Optional[str] = Header(None)) ->
     token = authorization.split("Bearer ")[1]
     
     try:
-        get_firebase_app()
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token["uid"]
+        return await get_token_verifier().verify(token)
     except auth.InvalidIdTokenError:
         raise HTTPException(status_code=401, detail="Invalid ID token")
     except auth.ExpiredIdTokenError:
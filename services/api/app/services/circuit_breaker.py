@@ -0,0 +1,193 @@
+"""
+Circuit Breakers
+Stop calling a provider model that keeps failing, so requests go straight to
+their fallbacks instead of each waiting out its own failure
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .provider_governor import (
+    ELEVENLABS_TTS,
+    GEMINI_IMAGE,
+    GEMINI_TEXT,
+    PROVIDER_DEFAULTS,
+    get_provider_governor,
+)
+
+
+T = TypeVar("T")
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Default seconds before a single provider call counts as failed
+DEFAULT_TIMEOUTS = {
+    GEMINI_TEXT: 60.0,
+    GEMINI_IMAGE: 120.0,
+    ELEVENLABS_TTS: 60.0,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider model whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls flow and consecutive failures are counted. After
+    failure_threshold in a row the breaker opens and rejects calls for
+    recovery_seconds, then turns half-open and admits a single trial call.
+    A successful trial closes it; a failed one opens it again.
+
+    Every state change starts a new generation. A call's outcome only counts
+    in the generation that admitted it, so a slow call admitted before a trip
+    can't close the breaker or cut short its half-open trial.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        timeout_seconds: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.timeout_seconds = timeout_seconds
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._generation = 0
+        self.rejected = 0
+        self.trips = 0
+
+    def _enter(self, state: str):
+        self.state = state
+        self._generation += 1
+
+    def _admit(self) -> Optional[Tuple[int, bool]]:
+        """Admit a call: (generation, is the half-open trial), or None if rejected."""
+        if self.state == CIRCUIT_OPEN:
+            if time.monotonic() - self._opened_at < self.recovery_seconds:
+                return None
+            self._enter(CIRCUIT_HALF_OPEN)
+        if self.state == CIRCUIT_HALF_OPEN:
+            if self._trial_running:
+                return None
+            self._trial_running = True
+            return self._generation, True
+        return self._generation, False
+
+    def _on_success(self, generation: int, trial: bool):
+        if generation != self._generation:
+            return
+        self._failures = 0
+        if trial:
+            self._trial_running = False
+            print(f"[CIRCUIT] {self.name} closed")
+            self._enter(CIRCUIT_CLOSED)
+
+    def _on_failure(self, generation: int, trial: bool):
+        if generation != self._generation:
+            return
+        self._failures += 1
+        if trial:
+            self._trial_running = False
+        if trial or self._failures >= self.failure_threshold:
+            if not trial:
+                self.trips += 1
+                print(f"[CIRCUIT] {self.name} opened after {self._failures} failures")
+            self._enter(CIRCUIT_OPEN)
+            self._opened_at = time.monotonic()
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Run the body as one provider call. Raises CircuitOpenError while open."""
+        admission = self._admit()
+        if admission is None:
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        generation, trial = admission
+        try:
+            yield
+        except Exception:
+            self._on_failure(generation, trial)
+            raise
+        except BaseException:
+            # Cancelled: says nothing about the provider, but frees the trial slot
+            if trial:
+                self._trial_running = False
+            raise
+        else:
+            self._on_success(generation, trial)
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = 0.0
+        if self.state == CIRCUIT_OPEN:
+            retry_in = max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+        return {
+            "state": self.state,
+            "consecutiveFailures": self._failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retryInSeconds": round(retry_in, 1),
+        }
+
+
+# Singleton instances, one per provider and model
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str, model: str) -> CircuitBreaker:
+    """
+    Get the shared breaker for a provider model. Thresholds come from
+    CIRCUIT_FAILURE_THRESHOLD and CIRCUIT_RECOVERY_SECONDS, call timeouts
+    from {PREFIX}_TIMEOUT_SECONDS.
+    """
+    name = f"{provider}:{model}"
+    if name not in _breakers:
+        prefix = PROVIDER_DEFAULTS[provider][0]
+        _breakers[name] = CircuitBreaker(
+            name,
+            failure_threshold=max(1, int(os.getenv("CIRCUIT_FAILURE_THRESHOLD") or "5")),
+            recovery_seconds=float(os.getenv("CIRCUIT_RECOVERY_SECONDS") or "30"),
+            timeout_seconds=float(os.getenv(f"{prefix}_TIMEOUT_SECONDS") or DEFAULT_TIMEOUTS[provider])
+        )
+    return _breakers[name]
+
+
+async def call_provider(provider: str, model: str, request: Callable[[], Awaitable[T]]) -> T:
+    """
+    Call a provider model through its circuit breaker and then its governor.
+    An open breaker rejects the call before it queues for quota; each
+    attempt the governor admits is bounded by the breaker's timeout.
+    """
+    breaker = get_circuit_breaker(provider, model)
+
+    async def attempt() -> T:
+        return await asyncio.wait_for(request(), breaker.timeout_seconds)
+
+    async with breaker.guard():
+        return await get_provider_governor(provider).call(attempt)
+
+
+async def call_provider_blocking(provider: str, model: str, fn: Callable[[], T]) -> T:
+    """
+    call_provider for SDKs without an async API. fn runs on the governor's
+    thread pool; an attempt that times out keeps its slot until the thread
+    returns, so overruns can't push the provider past its concurrency limit.
+    """
+    breaker = get_circuit_breaker(provider, model)
+    async with breaker.guard():
+        return await get_provider_governor(provider).call_blocking(fn, breaker.timeout_seconds)
+
+
+def circuit_states() -> Dict[str, Any]:
+    """State of every breaker created so far, for /health."""
+    return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
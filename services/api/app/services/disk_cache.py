@@ -0,0 +1,160 @@
+"""
+Disk Cache
+Byte-capped, content-addressed file cache shared safely by multiple worker processes
+"""
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+# Every entry starts with the time it was written, so TTL survives LRU touches
+_HEADER = struct.Struct(">d")
+
+
+class DiskCache:
+    """
+    Stores byte blobs under hex keys in a sharded directory tree.
+
+    - Writes go to a temp file in the target directory and are moved into
+      place with os.replace, so readers in other processes never see a
+      partial entry.
+    - A hit bumps the file's mtime; eviction removes the least recently
+      used files until the directory is back under max_bytes.
+    - Entries older than ttl_seconds (if set) are treated as misses.
+    - Safe to call from worker threads; counters and eviction are locked.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        ttl_seconds: Optional[float] = None,
+        suffix: str = ".bin"
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._approx_bytes = self._scan_size()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._count_miss()
+            return None
+
+        if len(data) < _HEADER.size:
+            self._remove(path)
+            self._count_miss()
+            return None
+
+        (written_at,) = _HEADER.unpack_from(data)
+        if self.ttl_seconds is not None and time.time() - written_at > self.ttl_seconds:
+            self._remove(path)
+            self._count_miss()
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data[_HEADER.size:]
+
+    def _count_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def set(self, key: str, value: bytes):
+        """Atomically store value under key, evicting old entries if over the cap."""
+        path = self._path(key)
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=shard, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(time.time()))
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[CACHE] Failed to write {path}: {e}")
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            self.writes += 1
+            self._approx_bytes += len(value) + _HEADER.size
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str):
+        self._remove(self._path(key))
+
+    def _remove(self, path: str) -> int:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except OSError:
+            # Another worker may already have evicted it
+            return 0
+
+    def _entries(self):
+        """Yield (mtime, size, path) for every committed entry."""
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".tmp-") or not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, entry.path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete least recently used entries until under 90% of the cap. Caller holds the lock."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+        self._approx_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "approxBytes": self._approx_bytes,
+            "maxBytes": self.max_bytes,
+        }
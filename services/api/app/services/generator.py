@@ -2,13 +2,19 @@
 Lesson Plan Generator Service
 Uses Google Gemini API to generate structured biology lesson plans
 """
+import asyncio
 import json
 import os
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
 import google.generativeai as genai
 
 from ..models.lesson import LessonPlan, GenerateRequest
+from .json_stream import TopLevelObjectParser
+from .lesson_cache import get_lesson_cache
+from .circuit_breaker import call_provider, get_circuit_breaker
+from .provider_governor import GEMINI_TEXT, get_provider_governor
 
 
 # Evolution knowledge pack for demo quality, just our fall back example for proof of concept, and its what the prompt outputs if API credits fail(Works much better with custom prompt for specific topics/animal evolutions)
@@ -47,6 +53,27 @@ SYSTEM_PROMPT = """You are a biology curriculum developer. Generate lesson plans
 Requirements: grade-appropriate content, low-cost materials, include misconceptions.
 Return ONLY valid JSON, no markdown."""
 
+# Lessons generated at once by a bulk request
+BULK_GENERATE_CONCURRENCY = int(os.getenv("BULK_GENERATE_CONCURRENCY") or "4")
+
+LESSON_MODEL = "gemini-2.0-flash-lite"
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "max_output_tokens": 2000,
+    "response_mime_type": "application/json",
+}
+
+
+@dataclass
+class LessonStreamEvent:
+    """A completed top-level section of the plan, or the final validated plan."""
+    section: Optional[str] = None
+    value: Any = None
+    plan: Optional[LessonPlan] = None
+    is_fallback: bool = False
+
 
 def get_generation_prompt(request: GenerateRequest) -> str:
     """Build the generation prompt with schema and requirements."""
@@ -214,31 +241,65 @@ class LessonGenerator:
         else:
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel(
-                model_name="gemini-2.0-flash-lite",
+                model_name=LESSON_MODEL,
                 system_instruction=SYSTEM_PROMPT
             )
     
     async def generate(self, request: GenerateRequest) -> LessonPlan:
-        """Generate a lesson plan from the request."""
+        """Generate a lesson plan from the request, serving repeats from cache."""
+        cache = get_lesson_cache()
+        cached = await cache.get(request)
+        if cached is not None:
+            return cached
         
-        if not self.model:
-            # No API key - return fallback
+        lesson_plan = await self._generate_with_model(request)
+        if lesson_plan is None:
             return get_fallback_lesson_plan(request)
         
+        await cache.put(request, lesson_plan)
+        return lesson_plan
+    
+    async def generate_many(
+        self,
+        requests: List[GenerateRequest],
+        concurrency: int = BULK_GENERATE_CONCURRENCY
+    ) -> AsyncIterator[Tuple[int, Optional[LessonPlan]]]:
+        """
+        Generate plans for several requests, at most `concurrency` at a time.
+        Yields (index, plan) in completion order; plan is None if that
+        request raised. Stopping iteration early cancels unfinished work.
+        """
+        limit = asyncio.Semaphore(max(1, concurrency))
+        
+        async def one(index: int, request: GenerateRequest) -> Tuple[int, Optional[LessonPlan]]:
+            async with limit:
+                try:
+                    return index, await self.generate(request)
+                except Exception as e:
+                    print(f"Bulk generation error for item {index}: {e}")
+                    return index, None
+        
+        tasks = [asyncio.create_task(one(index, request)) for index, request in enumerate(requests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _generate_with_model(self, request: GenerateRequest) -> Optional[LessonPlan]:
+        """Call Gemini and validate the result. Returns None if generation fails."""
+        
+        if not self.model:
+            # No API key - caller falls back
+            return None
+        
         try:
             prompt = get_generation_prompt(request)
             
-            # Use generation config for JSON output
-            generation_config = {
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "max_output_tokens": 2000,
-                "response_mime_type": "application/json",
-            }
-            
-            response = await self.model.generate_content_async(
-                prompt,
-                generation_config=generation_config
+            response = await call_provider(
+                GEMINI_TEXT, LESSON_MODEL,
+                lambda: self.model.generate_content_async(prompt, generation_config=GENERATION_CONFIG)
             )
             
             content = response.text
@@ -250,8 +311,63 @@ class LessonGenerator:
             
         except Exception as e:
             print(f"Generation error: {e}")
-            # Return fallback on any error
-            return get_fallback_lesson_plan(request)
+            return None
+    
+    async def generate_stream(self, request: GenerateRequest) -> AsyncIterator[LessonStreamEvent]:
+        """
+        Generate a lesson plan with Gemini's streaming API.
+        Yields each top-level section as soon as it has fully arrived, then
+        a final event carrying the validated plan. On any failure the
+        fallback plan's sections are yielded so clients can replace what
+        they have already rendered.
+        """
+        cache = get_lesson_cache()
+        cached = await cache.get(request)
+        if cached is not None:
+            for key, value in cached.model_dump().items():
+                yield LessonStreamEvent(section=key, value=value)
+            yield LessonStreamEvent(plan=cached)
+            return
+        
+        if self.model:
+            sections = {}
+            try:
+                parser = TopLevelObjectParser()
+                breaker = get_circuit_breaker(GEMINI_TEXT, LESSON_MODEL)
+                # The slot is held for the whole stream, which occupies the connection.
+                # Waiting on Gemini is bounded per chunk, so a stalled stream
+                # frees its slot and counts as a breaker failure.
+                async with breaker.guard(), get_provider_governor(GEMINI_TEXT).slot():
+                    response = await asyncio.wait_for(
+                        self.model.generate_content_async(
+                            get_generation_prompt(request),
+                            generation_config=GENERATION_CONFIG,
+                            stream=True
+                        ),
+                        breaker.timeout_seconds
+                    )
+                    chunks = response.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(anext(chunks), breaker.timeout_seconds)
+                        except StopAsyncIteration:
+                            break
+                        for key, value in parser.feed(chunk.text):
+                            sections[key] = value
+                            yield LessonStreamEvent(section=key, value=value)
+                
+                lesson_plan = LessonPlan(**sections)
+                await cache.put(request, lesson_plan)
+                yield LessonStreamEvent(plan=lesson_plan)
+                return
+                
+            except Exception as e:
+                print(f"Streaming generation error: {e!r}")
+        
+        fallback = get_fallback_lesson_plan(request)
+        for key, value in fallback.model_dump().items():
+            yield LessonStreamEvent(section=key, value=value)
+        yield LessonStreamEvent(plan=fallback, is_fallback=True)
 
 
 # Singleton instance
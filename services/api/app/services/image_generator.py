@@ -4,9 +4,154 @@ Uses Gemini 2.0 Flash for generating slide images
 """
 import os
 import base64
-from typing import Optional
+import hashlib
+import struct
+import time
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional, Tuple
 import asyncio
 
+import numpy as np
+
+from .disk_cache import DiskCache
+from .circuit_breaker import call_provider_blocking
+from .provider_governor import GEMINI_IMAGE
+from .video_assembler import VIDEO_RESOLUTION
+
+
+IMAGE_MODEL = "gemini-2.0-flash-exp"
+
+DEFAULT_IMAGE_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache", "images"
+)
+
+
+# Colors for different slides
+PLACEHOLDER_COLORS = [
+    (66, 133, 244),   # Blue
+    (52, 168, 83),    # Green
+    (251, 188, 4),    # Orange
+    (154, 83, 212),   # Purple
+    (26, 188, 156),   # Teal
+    (234, 67, 149),   # Pink
+]
+
+
+def _parse_size(value: str) -> Tuple[int, int]:
+    """Parse a WIDTHxHEIGHT string."""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+# Render placeholders at the video's output resolution to avoid rescaling
+PLACEHOLDER_SIZE = _parse_size(os.getenv("PLACEHOLDER_SIZE")) if os.getenv("PLACEHOLDER_SIZE") else VIDEO_RESOLUTION
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    chunk = chunk_type + data
+    crc = zlib.crc32(chunk) & 0xffffffff
+    return struct.pack('>I', len(data)) + chunk + struct.pack('>I', crc)
+
+
+@lru_cache(maxsize=32)
+def render_placeholder_png(color: Tuple[int, int, int], width: int = 640, height: int = 360) -> bytes:
+    """
+    Render a gradient placeholder PNG in one vectorized pass.
+    The gradient is defined on a 640x360 grid and stretched to the requested
+    size, so every resolution looks the same. Memoized per (color, size).
+    """
+    ys = (np.arange(height) * 360 // height)[:, None]
+    xs = (np.arange(width) * 640 // width)[None, :]
+    
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[..., 0] = np.clip(color[0] + ys // 8, 0, 255)
+    pixels[..., 1] = np.clip(color[1] + xs // 15, 0, 255)
+    pixels[..., 2] = np.clip(color[2] - ys // 10, 0, 255)
+    
+    # Each scanline is prefixed with filter byte 0 (None)
+    raw = np.zeros((height, 1 + width * 3), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 3)
+    compressed = zlib.compress(raw.tobytes(), 9)
+    
+    png = b'\x89PNG\r\n\x1a\n'
+    png += _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    png += _png_chunk(b'IDAT', compressed)
+    png += _png_chunk(b'IEND', b'')
+    return png
+
+
+def build_image_prompt(prompt: str) -> str:
+    """Wrap a slide's image prompt with the house illustration style."""
+    return f"""Create an educational illustration for a video slide about: {prompt}
+
+Requirements:
+- Style: Clear, colorful, professional educational illustration
+- Suitable for students and educational content
+- No text or labels in the image
+- 16:9 aspect ratio composition
+- Vibrant and engaging colors"""
+
+
+def image_cache_key(enhanced_prompt: str, model: str = IMAGE_MODEL) -> str:
+    """Cache key for a generated image: hash of model name and full prompt."""
+    return hashlib.sha256(f"{model}\n{enhanced_prompt}".encode("utf-8")).hexdigest()
+
+
+class HedgingPolicy:
+    """
+    Decides when to send a duplicate image request: once the first has been
+    outstanding longer than a percentile of recent call latencies, learned
+    from a sliding window. Latencies include time spent queued behind the
+    provider governor, so hedges back off by themselves when the quota is
+    the bottleneck. Abandoned requests are recorded at the time they were
+    given up on, so cutting off the slow tail doesn't drag the percentile down.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool,
+        percentile: float = 95,
+        max_hedges: int = 1,
+        min_samples: int = 20,
+        window: int = 200
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_hedges = max_hedges
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedged_requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.abandoned = 0
+    
+    def record(self, seconds: float):
+        self._latencies.append(seconds)
+    
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while hedging is off or still learning."""
+        if not self.enabled or self.max_hedges < 1 or len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+    
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "hedgedRequests": self.hedged_requests,
+            "hedges": self.hedges,
+            "hedgeWins": self.hedge_wins,
+            "abandoned": self.abandoned,
+            "hedgeRate": round(self.hedged_requests / self.requests, 3) if self.requests else 0.0,
+            "hedgeDelaySeconds": round(delay, 3) if delay is not None else None,
+            "samples": len(self._latencies),
+        }
+
 
 class ImageGenerator:
     """Service for generating slide images using Gemini 2.0 Flash."""
@@ -14,6 +159,17 @@ class ImageGenerator:
     def __init__(self):
         self.api_key = os.getenv("GEMINI_KEY")
         self.client = None
+        self.cache = DiskCache(
+            os.getenv("IMAGE_CACHE_DIR") or DEFAULT_IMAGE_CACHE_DIR,
+            max_bytes=int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))),
+            suffix=".img"
+        )
+        self.hedging = HedgingPolicy(
+            enabled=os.getenv("IMAGE_HEDGING_ENABLED", "false").lower() in ("1", "true", "yes"),
+            percentile=float(os.getenv("IMAGE_HEDGE_PERCENTILE") or "95"),
+            max_hedges=int(os.getenv("IMAGE_MAX_HEDGES") or "1"),
+            min_samples=int(os.getenv("IMAGE_HEDGE_MIN_SAMPLES") or "20")
+        )
         
         if self.api_key:
             try:
@@ -29,40 +185,27 @@ class ImageGenerator:
         """
         Generate an image from a text prompt using Gemini 2.0 Flash.
         Returns image bytes (PNG format) or placeholder if generation fails.
+        Real images are cached on disk by prompt; placeholders never are.
         """
+        enhanced_prompt = build_image_prompt(prompt)
+        cache_key = image_cache_key(enhanced_prompt)
+        
+        # File I/O and eviction scans stay off the event loop
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached is not None:
+            print(f"[IMAGE] Cache hit for slide {slide_number}")
+            return cached
+        
         if not self.client:
             print(f"[IMAGE] No client, using placeholder for slide {slide_number}")
             return self._generate_placeholder(prompt, slide_number)
         
         try:
-            from google.genai import types
-            
-            # Use Gemini 2.0 Flash with image output
-            enhanced_prompt = f"""Create an educational illustration for a video slide about: {prompt}
-
-Requirements:
-- Style: Clear, colorful, professional educational illustration
-- Suitable for students and educational content
-- No text or labels in the image
-- 16:9 aspect ratio composition
-- Vibrant and engaging colors"""
-            
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
-                model="gemini-2.0-flash-exp",
-                contents=enhanced_prompt,
-                config=types.GenerateContentConfig(
-                    response_modalities=["IMAGE", "TEXT"],
-                )
-            )
-            
-            # Extract image from response
-            if response.candidates:
-                for part in response.candidates[0].content.parts:
-                    if hasattr(part, 'inline_data') and part.inline_data:
-                        if part.inline_data.mime_type.startswith('image/'):
-                            print(f"[IMAGE] Generated image for slide {slide_number}")
-                            return part.inline_data.data
+            image = await self._request_hedged(enhanced_prompt, slide_number)
+            if image:
+                print(f"[IMAGE] Generated image for slide {slide_number}")
+                await asyncio.to_thread(self.cache.set, cache_key, image)
+                return image
             
             print(f"[IMAGE] No image in response, using placeholder for slide {slide_number}")
             return self._generate_placeholder(prompt, slide_number)
@@ -71,54 +214,98 @@ Requirements:
             print(f"[IMAGE] Generation error for slide {slide_number}: {e}")
             return self._generate_placeholder(prompt, slide_number)
     
-    def _generate_placeholder(self, prompt: str, slide_number: int) -> bytes:
-        """Generate a colored placeholder PNG image."""
-        import struct
-        import zlib
-        
-        # Colors for different slides
-        colors = [
-            (66, 133, 244),   # Blue
-            (52, 168, 83),    # Green  
-            (251, 188, 4),    # Orange
-            (154, 83, 212),   # Purple
-            (26, 188, 156),   # Teal
-            (234, 67, 149),   # Pink
-        ]
-        
-        color = colors[slide_number % len(colors)]
-        width, height = 640, 360
-        
-        # Create raw pixel data with gradient
-        raw_data = b''
-        for y in range(height):
-            raw_data += b'\x00'  # Filter byte
-            for x in range(width):
-                # Gradient effect
-                r = min(255, color[0] + (y // 8))
-                g = min(255, color[1] + (x // 15))
-                b = min(255, color[2] - (y // 10))
-                raw_data += bytes([max(0, r), max(0, g), max(0, b)])
-        
-        compressed = zlib.compress(raw_data, 9)
-        
-        def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
-            chunk = chunk_type + data
-            crc = zlib.crc32(chunk) & 0xffffffff
-            return struct.pack('>I', len(data)) + chunk + struct.pack('>I', crc)
+    async def _request_image(self, enhanced_prompt: str) -> Optional[bytes]:
+        """
+        One Gemini call, within the shared quota and the model's circuit
+        breaker. Returns None if no image came back.
+        """
+        from google.genai import types
         
-        png = b'\x89PNG\r\n\x1a\n'
-        ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
-        png += png_chunk(b'IHDR', ihdr_data)
-        png += png_chunk(b'IDAT', compressed)
-        png += png_chunk(b'IEND', b'')
+        # Use Gemini 2.0 Flash with image output
+        response = await call_provider_blocking(GEMINI_IMAGE, IMAGE_MODEL, lambda: self.client.models.generate_content(
+            model=IMAGE_MODEL,
+            contents=enhanced_prompt,
+            config=types.GenerateContentConfig(
+                response_modalities=["IMAGE", "TEXT"],
+            )
+        ))
         
-        return png
+        # Extract image from response
+        if response.candidates:
+            for part in response.candidates[0].content.parts:
+                if hasattr(part, 'inline_data') and part.inline_data:
+                    if part.inline_data.mime_type.startswith('image/'):
+                        return part.inline_data.data
+        return None
+    
+    async def _request_hedged(self, enhanced_prompt: str, slide_number: int) -> Optional[bytes]:
+        """
+        Request an image, sending up to max_hedges duplicates spaced by the
+        hedge delay while earlier requests are outstanding. The first image
+        to arrive wins and the other requests are abandoned; each keeps its
+        governor slot until its thread returns, so losers still count against
+        the quota. Raises the last error if every request failed.
+        """
+        self.hedging.requests += 1
+        primary = asyncio.create_task(self._request_image(enhanced_prompt))
+        started = {primary: time.monotonic()}
+        pending = {primary}
+        hedges = 0
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                delay = self.hedging.delay() if hedges < self.hedging.max_hedges else None
+                done, pending = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    hedges += 1
+                    self.hedging.hedges += 1
+                    if hedges == 1:
+                        self.hedging.hedged_requests += 1
+                    print(f"[IMAGE] Slide {slide_number} slower than {delay:.1f}s, sending hedge {hedges}")
+                    hedge = asyncio.create_task(self._request_image(enhanced_prompt))
+                    started[hedge] = time.monotonic()
+                    pending.add(hedge)
+                    continue
+                
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    self.hedging.record(time.monotonic() - started[task])
+                    if task.result():
+                        if task is not primary:
+                            self.hedging.hedge_wins += 1
+                        return task.result()
+            
+            if error is not None:
+                raise error
+            return None
+        finally:
+            # The true latency of an abandoned request is at least this long
+            now = time.monotonic()
+            for task in pending:
+                task.cancel()
+                self.hedging.abandoned += 1
+                self.hedging.record(now - started[task])
+    
+    def _generate_placeholder(self, prompt: str, slide_number: int) -> bytes:
+        """Generate a colored placeholder PNG image."""
+        color = PLACEHOLDER_COLORS[slide_number % len(PLACEHOLDER_COLORS)]
+        width, height = PLACEHOLDER_SIZE
+        return render_placeholder_png(color, width, height)
     
     async def generate_slide_images(self, image_prompts: list[str]) -> list[Optional[bytes]]:
-        """Generate images for multiple slides in parallel."""
+        """
+        Generate images for multiple slides in parallel. The provider
+        governor decides how many actually reach Gemini at once.
+        """
         tasks = [self.generate_image(prompt, i) for i, prompt in enumerate(image_prompts)]
         return await asyncio.gather(*tasks)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the image cache."""
+        return self.cache.stats()
 
 
 def get_placeholder_image() -> bytes:
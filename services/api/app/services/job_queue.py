@@ -0,0 +1,215 @@
+"""
+Background Job Queue Service
+Runs long pipelines (video generation) on a bounded pool of workers
+"""
+import asyncio
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from .metrics import summarize
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity and cannot accept another job."""
+
+
+@dataclass
+class Job:
+    """A unit of background work and its lifecycle timestamps."""
+    id: str
+    kind: str
+    owner_uid: str
+    payload: Dict[str, Any]
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class JobQueueBackend(ABC):
+    """Storage and delivery of jobs. Swap this out for a shared queue (Redis, Cloud Tasks)."""
+
+    @abstractmethod
+    async def put(self, job: Job) -> None:
+        """Enqueue a job. Raises QueueFullError when at capacity."""
+
+    @abstractmethod
+    async def get(self) -> Job:
+        """Block until a job is available and return it."""
+
+    @abstractmethod
+    async def save(self, job: Job) -> None:
+        """Persist the job's current state."""
+
+    @abstractmethod
+    async def load(self, job_id: str) -> Optional[Job]:
+        """Load a job by ID, or None if unknown or expired."""
+
+    @abstractmethod
+    def depth(self) -> int:
+        """Number of jobs waiting to be picked up."""
+
+
+class LocalJobQueueBackend(JobQueueBackend):
+    """In-process backend built on asyncio.Queue. Jobs do not survive a restart."""
+
+    def __init__(self, max_depth: int = 100, retention_seconds: float = 3600):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_depth)
+        self._jobs: Dict[str, Job] = {}
+        self.retention_seconds = retention_seconds
+
+    async def put(self, job: Job) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self._queue.maxsize} jobs waiting)")
+        self._jobs[job.id] = job
+
+    async def get(self) -> Job:
+        return await self._queue.get()
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        self._prune()
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _prune(self):
+        """Drop finished jobs older than the retention window."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class JobQueue:
+    """Dispatches queued jobs to registered handlers with bounded concurrency."""
+
+    def __init__(self, backend: JobQueueBackend, concurrency: int = 2):
+        self.backend = backend
+        self.concurrency = max(1, concurrency)
+        self._handlers: Dict[str, JobHandler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self._run_times: Deque[float] = deque(maxlen=500)
+
+    def register_handler(self, kind: str, handler: JobHandler):
+        """Register the coroutine that executes jobs of the given kind."""
+        self._handlers[kind] = handler
+
+    async def start(self):
+        """Spawn the worker pool."""
+        if self._workers:
+            return
+        for i in range(self.concurrency):
+            self._workers.append(asyncio.create_task(self._worker(i)))
+        print(f"[JOBS] Started {self.concurrency} worker(s)")
+
+    async def stop(self):
+        """Cancel workers. Jobs still queued are dropped with a local backend."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, kind: str, owner_uid: str, payload: Dict[str, Any]) -> Job:
+        """Enqueue a job and return it immediately."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        job = Job(id=str(uuid.uuid4()), kind=kind, owner_uid=owner_uid, payload=payload)
+        await self.backend.put(job)
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        return await self.backend.load(job_id)
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job = await self.backend.get()
+            await self._run_job(job, worker_id)
+
+    async def _run_job(self, job: Job, worker_id: int):
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self._wait_times.append(job.started_at - job.created_at)
+        self._running += 1
+        await self.backend.save(job)
+        print(f"[JOBS] Worker {worker_id} picked up {job.kind} job {job.id}")
+
+        try:
+            job.result = await self._handlers[job.kind](job.payload)
+            job.status = JOB_SUCCEEDED
+            self._completed += 1
+        except Exception as e:
+            print(f"[JOBS] Job {job.id} failed: {e}")
+            job.status = JOB_FAILED
+            job.error = str(e)
+            self._failed += 1
+        finally:
+            job.finished_at = time.time()
+            self._run_times.append(job.finished_at - job.started_at)
+            self._running -= 1
+            await self.backend.save(job)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, worker utilization and wait-time metrics."""
+        return {
+            "queueDepth": self.backend.depth(),
+            "running": self._running,
+            "concurrency": self.concurrency,
+            "completed": self._completed,
+            "failed": self._failed,
+            "waitSeconds": summarize(self._wait_times),
+            "runSeconds": summarize(self._run_times),
+        }
+
+
+def _create_backend() -> JobQueueBackend:
+    """Build the queue backend selected by JOB_QUEUE_BACKEND."""
+    backend = os.getenv("JOB_QUEUE_BACKEND", "local")
+    if backend != "local":
+        raise ValueError(f"Unknown JOB_QUEUE_BACKEND '{backend}'")
+    return LocalJobQueueBackend(
+        max_depth=int(os.getenv("JOB_QUEUE_MAX_DEPTH", "100")),
+        retention_seconds=float(os.getenv("JOB_RETENTION_SECONDS", "3600")),
+    )
+
+
+# Singleton instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get singleton job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            backend=_create_backend(),
+            concurrency=int(os.getenv("VIDEO_WORKER_CONCURRENCY", "2")),
+        )
+    return _job_queue
@@ -0,0 +1,72 @@
+"""
+Incremental JSON Parsing
+Emits the members of a top-level JSON object as soon as each one is complete
+"""
+import json
+from typing import Any, List, Tuple
+
+
+class TopLevelObjectParser:
+    """
+    Feed text chunks of a single JSON object; get back each completed
+    top-level (key, value) pair as soon as its closing delimiter arrives.
+    Only string/bracket state is tracked while scanning, and each member
+    is decoded once with json.loads, so total work stays linear.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = -1
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk and return any members completed by it."""
+        self._buffer += chunk
+        members = []
+        buf = self._buffer
+        i = self._pos
+
+        while i < len(buf) and not self.done:
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    if ch != "{":
+                        raise ValueError("Top-level JSON value is not an object")
+                    self._member_start = i + 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.extend(self._take_member(buf, i))
+                    self.done = True
+            elif ch == "," and self._depth == 1:
+                members.extend(self._take_member(buf, i))
+                self._member_start = i + 1
+            i += 1
+
+        # Drop text that belongs to members already emitted
+        if self._member_start > 0:
+            self._buffer = buf[self._member_start:]
+            i -= self._member_start
+            self._member_start = 0
+        self._pos = i
+        return members
+
+    def _take_member(self, buf: str, end: int) -> List[Tuple[str, Any]]:
+        text = buf[self._member_start:end]
+        if not text.strip():
+            return []
+        return list(json.loads("{" + text + "}").items())
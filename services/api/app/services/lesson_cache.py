@@ -0,0 +1,143 @@
+"""
+Lesson Plan Cache
+Serves repeat GenerateRequests from memory or disk instead of calling Gemini again
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..models.lesson import GenerateRequest, LessonPlan
+from .disk_cache import DiskCache
+
+
+# Bump when the generation prompt changes so stale plans are not served
+CACHE_VERSION = "1"
+
+
+def _normalize_text(text: str) -> str:
+    """Case-fold and collapse whitespace."""
+    return " ".join(text.split()).casefold()
+
+
+def lesson_fingerprint(request: GenerateRequest) -> str:
+    """Content address of a request, ignoring case and whitespace differences."""
+    normalized = {
+        "v": CACHE_VERSION,
+        "region": _normalize_text(request.region),
+        "gradeBand": request.gradeBand,
+        "durationMinutes": request.durationMinutes,
+        "topicPrompt": _normalize_text(request.topicPrompt),
+    }
+    payload = json.dumps(normalized, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LessonPlanCache:
+    """
+    Two-tier cache of generated lesson plans.
+    Only plans that came back from Gemini should be stored; fallback
+    plans are never written, so a hit is always a real generation.
+    Memory hits return directly; disk reads and writes run in a thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 7 * 24 * 3600,
+        disk: Optional[DiskCache] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk = disk
+        self._memory: "OrderedDict[str, Tuple[float, LessonPlan]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    async def get(self, request: GenerateRequest) -> Optional[LessonPlan]:
+        """Look up a plan for the request, honouring its bypassCache flag."""
+        if request.bypassCache:
+            self.bypassed += 1
+            return None
+
+        key = lesson_fingerprint(request)
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, plan = entry
+            if time.time() - stored_at <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return plan
+            del self._memory[key]
+
+        if self.disk is not None:
+            data = await asyncio.to_thread(self.disk.get, key)
+            if data is not None:
+                try:
+                    plan = LessonPlan.model_validate_json(data)
+                except ValueError:
+                    await asyncio.to_thread(self.disk.delete, key)
+                else:
+                    self._remember(key, plan)
+                    self.disk_hits += 1
+                    return plan
+
+        self.misses += 1
+        return None
+
+    async def put(self, request: GenerateRequest, plan: LessonPlan):
+        """Store a plan generated by the model for this request."""
+        key = lesson_fingerprint(request)
+        self._remember(key, plan)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, plan.model_dump_json().encode("utf-8"))
+
+    def _remember(self, key: str, plan: LessonPlan):
+        self._memory[key] = (time.time(), plan)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hitRate": round(hits / lookups, 3) if lookups else 0.0,
+            "memoryEntries": len(self._memory),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+
+# Singleton instance
+_lesson_cache: Optional[LessonPlanCache] = None
+
+
+def get_lesson_cache() -> LessonPlanCache:
+    """Get singleton lesson plan cache instance."""
+    global _lesson_cache
+    if _lesson_cache is None:
+        ttl_seconds = float(os.getenv("LESSON_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        cache_dir = os.getenv("LESSON_CACHE_DIR")
+        disk = None
+        if cache_dir:
+            disk = DiskCache(
+                cache_dir,
+                max_bytes=int(os.getenv("LESSON_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))),
+                ttl_seconds=ttl_seconds,
+                suffix=".json"
+            )
+        _lesson_cache = LessonPlanCache(
+            max_entries=int(os.getenv("LESSON_CACHE_MAX_ENTRIES", "512")),
+            ttl_seconds=ttl_seconds,
+            disk=disk
+        )
+    return _lesson_cache
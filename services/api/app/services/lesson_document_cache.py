@@ -0,0 +1,132 @@
+"""
+Lesson Document Cache
+Serves repeat single-lesson reads from memory instead of Firestore while a
+teacher is viewing and editing a lesson
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..models.lesson import LessonDocument
+
+
+class LessonDocumentCache:
+    """
+    Owner-scoped read-through cache of validated LessonDocuments.
+    Writes through this process replace or drop entries immediately; the
+    short TTL bounds how long a write from another worker can go unseen.
+    Dropped IDs leave a timestamped tombstone for one TTL, so a read that
+    started before a delete or bulk write can't put its stale snapshot back.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 30
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # (owner, lesson ID) -> (stored at, size, document), least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, LessonDocument]]" = OrderedDict()
+        self._owners: Dict[str, str] = {}
+        # Lesson ID -> when it was invalidated, oldest first
+        self._tombstones: "OrderedDict[str, float]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def get(self, lesson_id: str, owner_uid: str) -> Optional[LessonDocument]:
+        key = (owner_uid, lesson_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, _, doc = entry
+            if time.time() - stored_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return doc
+            self._drop(key)
+
+        self.misses += 1
+        return None
+
+    def put(self, doc: LessonDocument, read_at: Optional[float] = None):
+        """
+        Store a document, unless a newer version of it is already cached.
+        read_at is the time.time() at which the read that produced doc began;
+        snapshots read before the lesson was last invalidated are skipped.
+        """
+        if read_at is not None:
+            invalidated_at = self._tombstones.get(doc.id)
+            if invalidated_at is not None and invalidated_at >= read_at:
+                self.stale_puts += 1
+                return
+
+        key = (doc.ownerUid, doc.id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[2].updatedAt > doc.updatedAt:
+                return
+            self._drop(key)
+
+        # Serialized size, a stable proxy for the memory the entry holds
+        size = len(doc.model_dump_json())
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.time(), size, doc)
+        self._owners[doc.id] = doc.ownerUid
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, lesson_ids: Iterable[str]):
+        now = time.time()
+        # Reads outlive a tombstone only if they take longer than a TTL
+        while self._tombstones and now - next(iter(self._tombstones.values())) > self.ttl_seconds:
+            self._tombstones.popitem(last=False)
+
+        for lesson_id in lesson_ids:
+            self._tombstones.pop(lesson_id, None)
+            self._tombstones[lesson_id] = now
+            owner_uid = self._owners.get(lesson_id)
+            if owner_uid is not None:
+                self._drop((owner_uid, lesson_id))
+                self.invalidations += 1
+
+    def _drop(self, key: Tuple[str, str]):
+        _, size, _ = self._entries.pop(key)
+        self._owners.pop(key[1], None)
+        self.bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "stalePuts": self.stale_puts,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "tombstones": len(self._tombstones),
+        }
+
+
+# Singleton instance
+_lesson_document_cache: Optional[LessonDocumentCache] = None
+
+
+def get_lesson_document_cache() -> LessonDocumentCache:
+    """Get singleton lesson document cache instance."""
+    global _lesson_document_cache
+    if _lesson_document_cache is None:
+        _lesson_document_cache = LessonDocumentCache(
+            max_entries=int(os.getenv("LESSON_DOC_CACHE_MAX_ENTRIES") or "1000"),
+            max_bytes=int(os.getenv("LESSON_DOC_CACHE_MAX_BYTES") or str(64 * 1024 * 1024)),
+            ttl_seconds=float(os.getenv("LESSON_DOC_CACHE_TTL_SECONDS") or "30")
+        )
+    return _lesson_document_cache
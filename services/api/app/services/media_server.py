@@ -0,0 +1,427 @@
+"""
+Media Server
+In-memory index of generated media plus an ASGI response with Range,
+conditional request and zero-copy support
+"""
+import mimetypes
+import os
+import time
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+MEDIA_TYPES = {
+    ".mp4": "video/mp4",
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+    ".webp": "image/webp",
+    ".jpg": "image/jpeg",
+    ".vtt": "text/vtt",
+}
+
+# Read size for the fallback path when the server has no zero-copy extension
+CHUNK_SIZE = 256 * 1024
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+PATHSEND_EXTENSION = "http.response.pathsend"
+
+# In-progress outputs from the assembler, never served
+_SKIPPED_SUFFIXES = (".partial", ".old")
+
+
+@dataclass(frozen=True)
+class MediaEntry:
+    """A servable file and the validators derived from its stat."""
+    name: str
+    path: str
+    size: int
+    mtime: float
+    etag: str
+    last_modified: str
+    media_type: str
+
+    @classmethod
+    def from_stat(cls, name: str, path: str, st: os.stat_result) -> "MediaEntry":
+        # Outputs are replaced atomically (new inode), so inode + size +
+        # mtime identifies the exact bytes: a strong validator
+        etag = f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+        media_type = MEDIA_TYPES.get(os.path.splitext(name)[1].lower())
+        if media_type is None:
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        return cls(
+            name=name,
+            path=path,
+            size=st.st_size,
+            mtime=st.st_mtime,
+            etag=etag,
+            last_modified=formatdate(st.st_mtime, usegmt=True),
+            media_type=media_type,
+        )
+
+    def matches(self, st: os.stat_result) -> bool:
+        return self.etag == MediaEntry.from_stat(self.name, self.path, st).etag
+
+
+class MediaIndex:
+    """
+    Maps names relative to the media root (e.g. "{id}.mp4",
+    "{id}/hls/index.m3u8") to MediaEntry records, so serving a hit needs no
+    filesystem probing. The assembler registers outputs as they are
+    committed; a miss falls back to one stat so files written by another
+    worker process are still found.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.lookups = 0
+        self.misses = 0
+        self.responses: Dict[int, int] = {}
+        self._entries: Dict[str, MediaEntry] = {}
+        self.scan()
+
+    def _name(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+
+    def _add(self, name: str, path: str) -> Optional[MediaEntry]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._entries.pop(name, None)
+            return None
+        entry = MediaEntry.from_stat(name, path, st)
+        self._entries[name] = entry
+        return entry
+
+    def scan(self):
+        """Rebuild the index from the media root."""
+        self._entries = {}
+        self.register_tree(self.root)
+
+    def register(self, path: str) -> Optional[MediaEntry]:
+        """Index (or re-index) a single file."""
+        return self._add(self._name(path), path)
+
+    def register_tree(self, directory: str):
+        """Replace every entry under directory with what is on disk now."""
+        prefix = self._name(directory)
+        self.discard(prefix)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not d.endswith(_SKIPPED_SUFFIXES)]
+            for filename in filenames:
+                if not filename.endswith(_SKIPPED_SUFFIXES):
+                    path = os.path.join(dirpath, filename)
+                    self._add(self._name(path), path)
+
+    def update(self, entry: MediaEntry):
+        self._entries[entry.name] = entry
+
+    def discard(self, name: str):
+        """Drop an entry, or every entry under a directory name."""
+        if name == ".":
+            self._entries.clear()
+            return
+        self._entries.pop(name, None)
+        prefix = name.rstrip("/") + "/"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    def lookup(self, name: str) -> Optional[MediaEntry]:
+        """Entry for name, or None if it is not servable."""
+        self.lookups += 1
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+
+        self.misses += 1
+        parts = name.split("/")
+        if not name or any(part in ("", ".", "..") for part in parts) or name.endswith(_SKIPPED_SUFFIXES):
+            return None
+        return self._add(name, os.path.join(self.root, *parts))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, status: int):
+        self.responses[status] = self.responses.get(status, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._entries),
+            "bytes": sum(entry.size for entry in self._entries.values()),
+            "lookups": self.lookups,
+            "misses": self.misses,
+            "responses": {str(status): count for status, count in sorted(self.responses.items())},
+        }
+
+
+def _validators(entry: MediaEntry) -> Dict[str, str]:
+    return {
+        "etag": entry.etag,
+        "last-modified": entry.last_modified,
+        "accept-ranges": "bytes",
+    }
+
+
+def _etag_list(value: str) -> List[str]:
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
+def _weak_match(value: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+    def opaque(tag: str) -> str:
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return any(tag == "*" or opaque(tag) == opaque(etag) for tag in _etag_list(value))
+
+
+def _parse_http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into an inclusive (start, end) pair.
+    Returns None when the header should be ignored (bad syntax or several
+    ranges, which are served as a full 200), and (size, size) when the
+    range cannot be satisfied.
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return None
+        else:
+            suffix = int(last)
+            if suffix == 0:
+                return size, size
+            start, end = max(0, size - suffix), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return size, size
+    return start, min(end, size - 1)
+
+
+class MediaResponse(Response):
+    """
+    Serve a MediaEntry with:
+    - If-None-Match / If-Modified-Since -> 304, after one stat confirms the
+      index still describes the file (another worker may have replaced it)
+    - Range -> 206 (single range), 416 when unsatisfiable, honouring If-Range
+    - zero-copy transfer through the ASGI zerocopysend or pathsend extensions
+      when the server offers them, chunked reads in a thread otherwise
+    The file's stat is re-checked against the index on open, so a file
+    replaced by another process is served (and re-indexed) correctly.
+    The base Response is initialised with the full 200 headers, so
+    callers and middleware can inspect or extend them as usual.
+    """
+
+    def __init__(
+        self,
+        index: MediaIndex,
+        entry: MediaEntry,
+        headers: Optional[Dict[str, str]] = None,
+        filename: Optional[str] = None
+    ):
+        self.index = index
+        self.entry = entry
+        extra_headers = dict(headers or {})
+        if filename:
+            extra_headers["content-disposition"] = f'attachment; filename="{filename}"'
+        super().__init__(
+            status_code=200,
+            headers={**extra_headers, **_validators(entry), "content-length": str(entry.size)},
+            media_type=entry.media_type
+        )
+
+    def _headers(self, entry: MediaEntry) -> Dict[str, str]:
+        """Headers set on this response, with entry's validators; length and type are per status."""
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in self.raw_headers
+            if key not in (b"content-length", b"content-type")
+        }
+        headers.update(_validators(entry))
+        return headers
+
+    def _plan(self, entry: MediaEntry, request_headers: Dict[str, str]) -> Tuple[int, int, int]:
+        """Decide (status, start, end) for the request; end is inclusive."""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if _weak_match(if_none_match, entry.etag):
+                return 304, 0, -1
+        else:
+            since = _parse_http_date(request_headers.get("if-modified-since", ""))
+            if since is not None and int(entry.mtime) <= since:
+                return 304, 0, -1
+
+        full = (200, 0, entry.size - 1)
+        range_header = request_headers.get("range")
+        if range_header is None or entry.size == 0:
+            return full
+
+        if_range = request_headers.get("if-range")
+        if if_range is not None:
+            if if_range.startswith('"') or if_range.startswith("W/"):
+                # If-Range requires the strong comparison
+                if if_range != entry.etag:
+                    return full
+            elif if_range != entry.last_modified:
+                return full
+
+        byte_range = parse_range(range_header, entry.size)
+        if byte_range is None:
+            return full
+        start, end = byte_range
+        if start >= entry.size:
+            return 416, 0, -1
+        return 206, start, end
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self._respond(scope, receive, send)
+        if self.background is not None:
+            await self.background()
+
+    async def _respond(self, scope: Scope, receive: Receive, send: Send):
+        request_headers = {
+            key.decode("latin-1").lower(): value.decode("latin-1")
+            for key, value in scope.get("headers", [])
+        }
+        send_body = scope.get("method", "GET") != "HEAD"
+        entry = self.entry
+        status, start, end = self._plan(entry, request_headers)
+
+        if status == 304:
+            # The index is per process: confirm the client's copy is still current
+            try:
+                st = await anyio.to_thread.run_sync(os.stat, entry.path)
+            except OSError:
+                self.index.discard(entry.name)
+                await self._send_empty(send, 404, {})
+                return
+            if not entry.matches(st):
+                entry = MediaEntry.from_stat(entry.name, entry.path, st)
+                self.index.update(entry)
+                status, start, end = self._plan(entry, request_headers)
+
+        file = None
+        if status in (200, 206):
+            try:
+                file = await anyio.to_thread.run_sync(open, entry.path, "rb")
+            except OSError:
+                self.index.discard(entry.name)
+                await self._send_empty(send, 404, {})
+                return
+            st = os.fstat(file.fileno())
+            if not entry.matches(st):
+                # Replaced since it was indexed: re-index and re-plan on the new bytes
+                entry = MediaEntry.from_stat(entry.name, entry.path, st)
+                self.index.update(entry)
+                status, start, end = self._plan(entry, request_headers)
+
+        try:
+            headers = self._headers(entry)
+            if status == 304:
+                await self._send_empty(send, 304, headers)
+                return
+            if status == 416:
+                headers["content-range"] = f"bytes */{entry.size}"
+                await self._send_empty(send, 416, headers)
+                return
+
+            length = end - start + 1
+            headers["content-type"] = entry.media_type
+            headers["content-length"] = str(length)
+            if status == 206:
+                headers["content-range"] = f"bytes {start}-{end}/{entry.size}"
+            self.index.record(status)
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+            })
+            if not send_body or length == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+
+            extensions = scope.get("extensions") or {}
+            if ZEROCOPY_EXTENSION in extensions:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": start,
+                    "count": length,
+                    "more_body": False,
+                })
+            elif PATHSEND_EXTENSION in extensions and status == 200:
+                await send({"type": PATHSEND_EXTENSION, "path": entry.path})
+            else:
+                await self._send_chunks(file, start, length, receive, send)
+        finally:
+            if file is not None:
+                file.close()
+
+    async def _send_empty(self, send: Send, status: int, headers: Dict[str, str]):
+        self.index.record(status)
+        if status != 304:
+            headers["content-length"] = "0"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        })
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_chunks(self, file, start: int, length: int, receive: Receive, send: Send):
+        """Stream the range in CHUNK_SIZE reads, stopping if the client goes away."""
+        async with anyio.create_task_group() as task_group:
+            async def watch_disconnect():
+                while (await receive())["type"] != "http.disconnect":
+                    pass
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(watch_disconnect)
+            file.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(file.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # Truncated underneath us: end the body rather than hang the client
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            task_group.cancel_scope.cancel()
+
+
+# Singleton instance
+_media_index: Optional[MediaIndex] = None
+
+
+def get_media_index() -> MediaIndex:
+    """Get singleton media index over the video output directory."""
+    global _media_index
+    if _media_index is None:
+        from .video_assembler import OUTPUT_DIR
+
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        started = time.perf_counter()
+        _media_index = MediaIndex(OUTPUT_DIR)
+        print(f"[MEDIA] Indexed {len(_media_index)} files in {time.perf_counter() - started:.3f}s")
+    return _media_index
@@ -0,0 +1,20 @@
+"""
+Metrics Helpers
+Summaries of latency samples shared by the stats that /metrics reports
+"""
+from typing import Dict, Iterable
+
+
+def summarize(samples: Iterable[float]) -> Dict[str, float]:
+    """Average, p50, p95 and max of a window of samples."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    n = len(ordered)
+    return {
+        "count": n,
+        "avg": round(sum(ordered) / n, 3),
+        "p50": round(ordered[n // 2], 3),
+        "p95": round(ordered[min(n - 1, int(n * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
@@ -0,0 +1,171 @@
+"""
+MP3 Duration Measurement
+Pure-Python frame header and Xing/Info/VBRI parsing, no ffprobe needed
+"""
+from typing import Optional, Tuple
+
+
+# Bitrates in kbps indexed by [version_key][layer][bitrate_index]
+# version_key: 1 = MPEG-1, 2 = MPEG-2 and MPEG-2.5
+_BITRATES = {
+    1: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    2: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates indexed by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+
+class FrameHeader:
+    """Decoded fields of a 4-byte MPEG audio frame header."""
+
+    __slots__ = ("mpeg1", "layer", "sample_rate", "samples", "length", "mono", "crc")
+
+    def __init__(self, mpeg1, layer, sample_rate, samples, length, mono, crc):
+        self.mpeg1 = mpeg1
+        self.layer = layer
+        self.sample_rate = sample_rate
+        self.samples = samples
+        self.length = length
+        self.mono = mono
+        self.crc = crc
+
+
+def parse_frame_header(data: bytes, offset: int) -> Optional[FrameHeader]:
+    """Decode the frame header at offset, or None if it is not a valid header."""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        # Reserved values, or "free format" which cannot be sized from the header
+        return None
+
+    mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[1 if mpeg1 else 2][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        length = samples // 8 * bitrate // sample_rate + padding
+
+    return FrameHeader(
+        mpeg1=mpeg1,
+        layer=layer,
+        sample_rate=sample_rate,
+        samples=samples,
+        length=length,
+        mono=((b3 >> 6) & 0x03) == 3,
+        crc=not (b1 & 0x01),
+    )
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Offset of the first byte after any ID3v2 tags."""
+    offset = 0
+    while data[offset:offset + 3] == b"ID3" and offset + 10 <= len(data):
+        size = 0
+        for byte in data[offset + 6:offset + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[offset + 5] & 0x10 else 0
+        offset += 10 + size + footer
+    return offset
+
+
+def _find_first_frame(data: bytes, start: int) -> Optional[Tuple[int, FrameHeader]]:
+    """Find a frame header that is followed by another valid header."""
+    offset = data.find(b"\xff", start)
+    while offset != -1:
+        header = parse_frame_header(data, offset)
+        if header is not None:
+            following = offset + header.length
+            if following >= len(data) or parse_frame_header(data, following) is not None:
+                return offset, header
+        offset = data.find(b"\xff", offset + 1)
+    return None
+
+
+def _read_u32(data: bytes, offset: int) -> int:
+    return int.from_bytes(data[offset:offset + 4], "big")
+
+
+def _vbr_header_duration(data: bytes, offset: int, header: FrameHeader) -> Optional[float]:
+    """Duration from a Xing/Info or VBRI header in the first frame, if present."""
+    side_info = (32 if not header.mono else 17) if header.mpeg1 else (17 if not header.mono else 9)
+    xing = offset + 4 + (2 if header.crc else 0) + side_info
+
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = _read_u32(data, xing + 4)
+        if not flags & 0x01:
+            return None
+        frames = _read_u32(data, xing + 8)
+        cursor = xing + 12
+        cursor += 4 if flags & 0x02 else 0
+        cursor += 100 if flags & 0x04 else 0
+        cursor += 4 if flags & 0x08 else 0
+
+        total_samples = frames * header.samples
+        # LAME-style extension (also written by libavcodec as "Lavc"/"Lavf"):
+        # 12-bit encoder delay and padding that decoders trim from the output
+        encoder = data[cursor:cursor + 4]
+        if len(encoder) == 4 and encoder.isalnum() and cursor + 24 <= len(data):
+            packed = int.from_bytes(data[cursor + 21:cursor + 24], "big")
+            total_samples -= (packed >> 12) + (packed & 0x0FFF)
+        return max(0, total_samples) / header.sample_rate
+
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        frames = _read_u32(data, vbri + 14)
+        return frames * header.samples / header.sample_rate
+
+    return None
+
+
+def mp3_duration(data: bytes) -> Optional[float]:
+    """
+    Exact duration in seconds of an MP3 byte string, or None if no MPEG
+    audio frames are found. Uses the Xing/Info/VBRI header when present,
+    otherwise walks every frame header and sums their samples.
+    """
+    if not data:
+        return None
+
+    found = _find_first_frame(data, _skip_id3v2(data))
+    if found is None:
+        return None
+    offset, header = found
+
+    duration = _vbr_header_duration(data, offset, header)
+    if duration is not None:
+        return duration
+
+    sample_rate = header.sample_rate
+    total_samples = 0
+    while header is not None and offset + header.length <= len(data):
+        total_samples += header.samples
+        offset += header.length
+        header = parse_frame_header(data, offset)
+    return total_samples / sample_rate
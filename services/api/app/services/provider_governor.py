@@ -0,0 +1,240 @@
+"""
+Provider Governor
+Shares each external provider's quota across all requests: a concurrency
+limit, a token-bucket rate limit, and backoff that adapts to 429 responses
+"""
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from .metrics import summarize
+
+
+T = TypeVar("T")
+
+GEMINI_TEXT = "gemini_text"
+GEMINI_IMAGE = "gemini_image"
+ELEVENLABS_TTS = "elevenlabs_tts"
+
+# Provider -> (env prefix, default max concurrency, default requests per minute)
+PROVIDER_DEFAULTS = {
+    GEMINI_TEXT: ("GEMINI_TEXT", 4, 30),
+    GEMINI_IMAGE: ("GEMINI_IMAGE", 4, 10),
+    ELEVENLABS_TTS: ("ELEVENLABS", 3, 120),
+}
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for the 429 errors raised by the Gemini and ElevenLabs SDKs."""
+    for attr in ("code", "status_code"):
+        if getattr(error, attr, None) == 429:
+            return True
+    return "RESOURCE_EXHAUSTED" in str(error)
+
+
+class _Lease:
+    """A held concurrency slot. Set until to keep it past the end of the block."""
+
+    def __init__(self):
+        self.until: Optional[asyncio.Future] = None
+
+
+class ProviderGovernor:
+    """
+    Admission control for one provider. Calls wait for a concurrency slot,
+    then for a rate-limit token. A 429 pauses admissions for an exponentially
+    growing, jittered backoff and halves the admitted rate; each success
+    restores a little of it, so throughput settles just under the real quota.
+    Blocking SDK calls run on the provider's own bounded thread pool, so they
+    never crowd out other to_thread work such as token verification.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        requests_per_minute: float,
+        max_retries: int = 3,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_rate = requests_per_minute / 60
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # Every thread holds a slot, so this pool never queues
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=name)
+        # Serializes token grants so waiters are admitted in arrival order
+        self._admission = asyncio.Lock()
+        self.rate = self.max_rate
+        # Bucket capacity: up to a full set of slots may start at once
+        self.burst = float(max_concurrency)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_limits = 0
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self.waiting = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.abandoned = 0
+
+    def _take_token(self) -> float:
+        """Take a token if one is available; otherwise return seconds until one is."""
+        now = time.monotonic()
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self.rate <= 0:
+            return 0.0
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[_Lease]:
+        """Hold a concurrency slot and one rate-limit token for a provider call."""
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+            try:
+                async with self._admission:
+                    while (delay := self._take_token()) > 0:
+                        await asyncio.sleep(delay)
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self._wait_times.append(time.monotonic() - queued_at)
+        self.in_flight += 1
+        self.calls += 1
+        lease = _Lease()
+        try:
+            yield lease
+        except Exception as e:
+            if is_rate_limited(e):
+                self._on_rate_limited()
+            raise
+        else:
+            self._on_success()
+        finally:
+            if lease.until is not None and not lease.until.done():
+                # The caller gave up on work that can't be stopped; it keeps
+                # using quota, so it keeps its slot until it really finishes
+                self.abandoned += 1
+                lease.until.add_done_callback(self._release_abandoned)
+            else:
+                self._release()
+
+    def _release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def _release_abandoned(self, future: asyncio.Future):
+        if not future.cancelled():
+            # Nobody awaits it any more; retrieve the error so it isn't logged as lost
+            future.exception()
+        self._release()
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run request() under the governor, retrying it after 429s."""
+        return await self._call(lambda lease: request())
+
+    async def call_blocking(self, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """
+        Run a blocking SDK call on this provider's thread pool, retrying it
+        after 429s. Each attempt is bounded by timeout; a thread can't be
+        cancelled, so one that overruns holds its slot until it returns.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def request(lease: _Lease) -> T:
+            lease.until = loop.run_in_executor(self._executor, fn)
+            return await asyncio.wait_for(asyncio.shield(lease.until), timeout)
+
+        return await self._call(request)
+
+    async def _call(self, request: Callable[[_Lease], Awaitable[T]]) -> T:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.slot() as lease:
+                    return await request(lease)
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limited(e):
+                    raise
+                self.retries += 1
+                print(f"[GOVERNOR] {self.name} rate limited, retry {attempt + 1}/{self.max_retries}")
+
+    def _on_rate_limited(self):
+        self.rate_limited += 1
+        self._consecutive_limits += 1
+        backoff = min(
+            self.max_backoff_seconds,
+            self.base_backoff_seconds * 2 ** (self._consecutive_limits - 1)
+        )
+        self._paused_until = max(self._paused_until, time.monotonic() + backoff * random.uniform(0.5, 1.0))
+        # Never below a tenth of the quota, so recovery doesn't take forever
+        self.rate = max(self.max_rate / 10, self.rate / 2)
+        self._tokens = 0.0
+
+    def _on_success(self):
+        self._consecutive_limits = 0
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "maxConcurrency": self.max_concurrency,
+            "inFlight": self.in_flight,
+            "queued": self.waiting,
+            "requestsPerMinute": round(self.rate * 60, 2),
+            "maxRequestsPerMinute": round(self.max_rate * 60, 2),
+            "pausedSeconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "calls": self.calls,
+            "rateLimited": self.rate_limited,
+            "retries": self.retries,
+            # Calls whose caller timed out or was cancelled; still in inFlight until their thread returns
+            "abandoned": self.abandoned,
+            "waitSeconds": summarize(self._wait_times),
+        }
+
+
+# Singleton instances, one per provider
+_governors: Dict[str, ProviderGovernor] = {}
+
+
+def get_provider_governor(provider: str) -> ProviderGovernor:
+    """
+    Get the shared governor for a provider. Limits come from
+    {PREFIX}_MAX_CONCURRENCY and {PREFIX}_REQUESTS_PER_MINUTE (0 disables
+    rate limiting).
+    """
+    if provider not in _governors:
+        prefix, concurrency, per_minute = PROVIDER_DEFAULTS[provider]
+        _governors[provider] = ProviderGovernor(
+            provider,
+            max_concurrency=max(1, int(os.getenv(f"{prefix}_MAX_CONCURRENCY") or concurrency)),
+            requests_per_minute=float(os.getenv(f"{prefix}_REQUESTS_PER_MINUTE") or per_minute),
+            max_retries=int(os.getenv("PROVIDER_MAX_RETRIES") or "3")
+        )
+    return _governors[provider]
+
+
+def governor_stats() -> Dict[str, Any]:
+    """Stats for every provider, for /metrics."""
+    return {provider: get_provider_governor(provider).stats() for provider in PROVIDER_DEFAULTS}
@@ -4,19 +4,60 @@ Uses ElevenLabs API for high-quality voice narration
 """
 import os
 import asyncio
-from typing import Optional, Tuple
+import hashlib
+import json
+import struct
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 import io
 
+from .disk_cache import DiskCache
+from .mp3_duration import mp3_duration
+from .circuit_breaker import call_provider_blocking
+from .provider_governor import ELEVENLABS_TTS
+
+
+DEFAULT_AUDIO_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache", "audio"
+)
+
+# Cached entries are the duration (big-endian double) followed by the MP3 bytes
+_DURATION = struct.Struct(">d")
+
+# Bumped when the stored duration changed from a word-count estimate to a measurement
+NARRATION_CACHE_VERSION = 2
+
+
+def narration_cache_key(text: str, voice_id: str, model_id: str, output_format: str) -> str:
+    """Cache key for a narration clip."""
+    payload = json.dumps(
+        [NARRATION_CACHE_VERSION, text, voice_id, model_id, output_format]
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
 
 class TTSGenerator:
     """Service for generating voice narration using ElevenLabs."""
     
     # Default voice ID - "Rachel" (clear, professional female voice)
     DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"
+    MODEL_ID = "eleven_multilingual_v2"
+    OUTPUT_FORMAT = "mp3_44100_128"
     
     def __init__(self):
         self.api_key = os.getenv("ELEVENLABS_KEY")
         self.client = None
+        self.cache = DiskCache(
+            os.getenv("TTS_CACHE_DIR") or DEFAULT_AUDIO_CACHE_DIR,
+            max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+            suffix=".mp3"
+        )
+        # Recent clips, so hits are answered without a thread-pool hop;
+        # key -> (audio bytes, duration), least recently used first
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self.memory_max_bytes = int(os.getenv("TTS_MEMORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.memory_hits = 0
         
         if self.api_key:
             try:
@@ -33,28 +74,48 @@ class TTSGenerator:
         """
         Generate audio narration from text.
         Returns (audio_bytes, duration_seconds) or (None, 0) if generation fails.
+        Clips are cached in memory and on disk, so recurring narrations
+        return immediately.
         """
+        voice_id = voice_id or self.DEFAULT_VOICE_ID
+        cache_key = narration_cache_key(text, voice_id, self.MODEL_ID, self.OUTPUT_FORMAT)
+        
+        remembered = self._memory.get(cache_key)
+        if remembered is not None:
+            self._memory.move_to_end(cache_key)
+            self.memory_hits += 1
+            return remembered
+        
+        # File I/O and eviction scans stay off the event loop
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached is not None:
+            (duration_seconds,) = _DURATION.unpack_from(cached)
+            audio_bytes = cached[_DURATION.size:]
+            self._remember(cache_key, audio_bytes, duration_seconds)
+            return audio_bytes, duration_seconds
+        
         if not self.client:
             print("TTS generator: No API key or client configured")
             return None, 0.0
         
         try:
-            # Run sync elevenlabs call in thread pool
-            audio_generator = await asyncio.to_thread(
-                self.client.text_to_speech.convert,
-                text=text,
-                voice_id=voice_id or self.DEFAULT_VOICE_ID,
-                model_id="eleven_multilingual_v2",
-                output_format="mp3_44100_128"
+            # Run sync elevenlabs call on the provider's thread pool, within the
+            # shared quota; fails fast while the model's circuit breaker is open
+            audio_bytes = await call_provider_blocking(
+                ELEVENLABS_TTS, self.MODEL_ID, lambda: self._convert(text, voice_id)
             )
             
-            # Convert generator to bytes
-            audio_bytes = b''.join(audio_generator)
+            # Measure duration from the MP3 frames; fall back to ~150 words per minute
+            duration_seconds = mp3_duration(audio_bytes)
+            if duration_seconds is None:
+                word_count = len(text.split())
+                duration_seconds = (word_count / 150) * 60
             
-            # Estimate duration (rough: ~150 words per minute, ~5 chars per word)
-            # More accurate would be to parse the actual audio header
-            word_count = len(text.split())
-            duration_seconds = (word_count / 150) * 60
+            if audio_bytes:
+                self._remember(cache_key, audio_bytes, duration_seconds)
+                await asyncio.to_thread(
+                    self.cache.set, cache_key, _DURATION.pack(duration_seconds) + audio_bytes
+                )
             
             return audio_bytes, duration_seconds
             
@@ -62,16 +123,53 @@ class TTSGenerator:
             print(f"TTS generation error: {e}")
             return None, 0.0
     
+    def _remember(self, cache_key: str, audio_bytes: bytes, duration_seconds: float):
+        if len(audio_bytes) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(cache_key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[0])
+        self._memory[cache_key] = (audio_bytes, duration_seconds)
+        self._memory_bytes += len(audio_bytes)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+    
+    def _convert(self, text: str, voice_id: str) -> bytes:
+        # The SDK streams the response lazily, so read it all in this thread
+        return b''.join(self.client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=self.MODEL_ID,
+            output_format=self.OUTPUT_FORMAT
+        ))
+    
     async def generate_slide_narrations(
         self, 
         narration_texts: list[str]
     ) -> list[Tuple[Optional[bytes], float]]:
         """
-        Generate audio for multiple slide narrations in parallel.
+        Generate audio for multiple slide narrations in parallel, as far
+        as the provider governor allows.
         Returns list of (audio_bytes, duration) tuples.
         """
         tasks = [self.generate_audio(text) for text in narration_texts]
         return await asyncio.gather(*tasks)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the narration cache, memory tier in front of disk."""
+        disk = self.cache.stats()
+        hits = self.memory_hits + disk["hits"]
+        lookups = hits + disk["misses"]
+        return {
+            "memoryHits": self.memory_hits,
+            "diskHits": disk["hits"],
+            "misses": disk["misses"],
+            "hitRate": round(hits / lookups, 3) if lookups else 0.0,
+            "memoryEntries": len(self._memory),
+            "memoryBytes": self._memory_bytes,
+            "disk": disk,
+        }
 
 
 # Singleton instance
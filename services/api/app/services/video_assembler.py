@@ -4,12 +4,150 @@ Uses FFmpeg to combine images and audio into a video
 """
 import os
 import asyncio
+import hashlib
+import math
+import secrets
 import tempfile
 import subprocess
 import shutil
-from typing import List, Optional, Tuple
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from .media_server import get_media_index
+from .mp3_duration import mp3_duration
+
+
+OUTPUT_DIR = os.getenv("VIDEO_OUTPUT_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "output"
+)
+
+# Assembly strategies
+MODE_TWO_STEP = "two_step"          # concat audio, then encode video (two FFmpeg runs)
+MODE_SINGLE_PASS = "single_pass"    # one FFmpeg run with a filter graph over all slides
+MODE_SEGMENTS = "segments"          # encode slides concurrently, then stream-copy concat
+ASSEMBLY_MODES = (MODE_TWO_STEP, MODE_SINGLE_PASS, MODE_SEGMENTS)
+
+VIDEO_RESOLUTION = tuple(int(v) for v in os.getenv("VIDEO_RESOLUTION", "1280x720").lower().split("x"))
+AUDIO_SAMPLE_RATE = 44100
+
+HLS_PLAYLIST = "index.m3u8"
+# Segment names carry a per-render token, so a re-render never reuses a
+# cached segment URL; only the playlist needs revalidating
+HLS_SEGMENT_PATTERN = "seg_{token}_%03d.ts"
+
+
+# Poster frames and the seek-preview sprite, rendered from the slide images
+THUMBNAIL_WIDTHS = tuple(int(w) for w in os.getenv("THUMBNAIL_WIDTHS", "320,640,1280").split(","))
+THUMBNAIL_FORMATS = ("webp", "jpg")
+POSTER_PATTERN = "poster_{width}.{ext}"
+SPRITE_IMAGE = "sprite.jpg"
+SPRITE_VTT = "sprite.vtt"
+PREVIEW_TILE_WIDTH = int(os.getenv("PREVIEW_TILE_WIDTH", "160"))
+PREVIEW_INTERVAL_SECONDS = float(os.getenv("PREVIEW_INTERVAL_SECONDS", "2"))
+PREVIEW_MAX_TILES = 100
+PREVIEW_COLUMNS = 10
+
+
+def video_asset_dir(video_id: str) -> str:
+    """Directory holding a video's derived assets (HLS rendition, etc.)."""
+    return os.path.join(OUTPUT_DIR, video_id)
+
+
+def hls_dir(video_id: str) -> str:
+    return os.path.join(video_asset_dir(video_id), "hls")
+
+
+def previews_dir(video_id: str) -> str:
+    return os.path.join(video_asset_dir(video_id), "previews")
+
+
+def preview_tiles(durations: List[float]) -> Tuple[float, List[int]]:
+    """
+    Sample the timeline every PREVIEW_INTERVAL_SECONDS (stretched so there
+    are at most PREVIEW_MAX_TILES) and return (interval, tiles per slide):
+    a tile shows whichever slide is on screen at its start time.
+    """
+    total = sum(durations)
+    interval = max(PREVIEW_INTERVAL_SECONDS, total / PREVIEW_MAX_TILES)
+    tile_count = max(1, math.ceil(total / interval - 1e-9))
+    counts = [0] * len(durations)
+    slide, slide_end = 0, durations[0]
+    for tile in range(tile_count):
+        while tile * interval >= slide_end and slide < len(durations) - 1:
+            slide += 1
+            slide_end += durations[slide]
+        counts[slide] += 1
+    return interval, counts
+
+
+def _vtt_timestamp(seconds: float) -> str:
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    return f"{hours:02d}:{minutes:02d}:{millis / 1000:06.3f}"
+
+
+def build_sprite_vtt(total_seconds: float, interval: float, tiles: int, sprite_url: str) -> str:
+    """WebVTT index mapping each interval of the video to its tile in the sprite."""
+    tile_width, tile_height = _tile_size()
+    lines = ["WEBVTT", ""]
+    for tile in range(tiles):
+        start = tile * interval
+        end = min(total_seconds, start + interval)
+        x = (tile % PREVIEW_COLUMNS) * tile_width
+        y = (tile // PREVIEW_COLUMNS) * tile_height
+        lines += [
+            f"{_vtt_timestamp(start)} --> {_vtt_timestamp(end)}",
+            f"{sprite_url}#xywh={x},{y},{tile_width},{tile_height}",
+            ""
+        ]
+    return "\n".join(lines)
+
+
+def _tile_size() -> Tuple[int, int]:
+    width, height = VIDEO_RESOLUTION
+    return PREVIEW_TILE_WIDTH, round(PREVIEW_TILE_WIDTH * height / width / 2) * 2
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """libx264/AAC settings for a slideshow encode."""
+    name: str
+    preset: str
+    crf: int
+    fps: int
+    gop_seconds: float
+    audio_bitrate: str
+    # Slides are static pictures; stillimage tuning spends bits on detail, not motion
+    tune: str = "stillimage"
+    
+    def video_args(self) -> List[str]:
+        gop = max(1, round(self.fps * self.gop_seconds))
+        return [
+            "-c:v", "libx264",
+            "-preset", self.preset,
+            "-tune", self.tune,
+            "-crf", str(self.crf),
+            "-g", str(gop),
+            "-keyint_min", str(gop),
+            "-pix_fmt", "yuv420p",
+        ]
+    
+    def audio_args(self) -> List[str]:
+        return ["-c:a", "aac", "-b:a", self.audio_bitrate]
+
+
+ENCODING_PROFILES: Dict[str, EncodingProfile] = {
+    # Fast previews: few frames per second, coarse quantizer
+    "draft": EncodingProfile("draft", preset="ultrafast", crf=32, fps=5, gop_seconds=4, audio_bitrate="64k"),
+    "standard": EncodingProfile("standard", preset="veryfast", crf=26, fps=10, gop_seconds=2, audio_bitrate="96k"),
+    # Keep for redistribution: slower preset, finer quantizer, full narration bitrate
+    "archive": EncodingProfile("archive", preset="slow", crf=20, fps=15, gop_seconds=2, audio_bitrate="128k"),
+}
+DEFAULT_ENCODING_PROFILE = "standard"
+
 
 @dataclass
 class SlideAssets:
@@ -18,6 +156,67 @@ class SlideAssets:
     image_bytes: Optional[bytes]
     audio_bytes: Optional[bytes]
     duration_seconds: float
+    
+    def __post_init__(self):
+        # Time the slide to the exact length of its narration when we have one
+        if self.audio_bytes:
+            measured = mp3_duration(self.audio_bytes)
+            if measured:
+                self.duration_seconds = measured
+
+
+def _write_feed(fd: int, data: bytes):
+    """Write a whole input into a pipe, then close it so FFmpeg sees EOF."""
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    except BrokenPipeError:
+        # FFmpeg stopped reading (e.g. it failed early); its exit code reports why
+        pass
+
+
+def run_ffmpeg(args: List[str], feeds: Optional[List[bytes]] = None):
+    """
+    Run FFmpeg synchronously. Each entry in feeds is streamed to the child
+    on its own pipe; reference it in args as "{feed0}", "{feed1}", ...
+    Raises subprocess.CalledProcessError on failure.
+    """
+    feeds = feeds or []
+    pipes = [os.pipe() for _ in feeds]
+    read_fds = [r for r, _ in pipes]
+    cmd = ["ffmpeg"] + [
+        arg.format(**{f"feed{i}": f"pipe:{fd}" for i, fd in enumerate(read_fds)}) if "{feed" in arg else arg
+        for arg in args
+    ]
+    
+    try:
+        process = subprocess.Popen(
+            cmd,
+            pass_fds=read_fds,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+    except Exception:
+        for r, w in pipes:
+            os.close(r)
+            os.close(w)
+        raise
+    
+    for fd in read_fds:
+        os.close(fd)
+    writers = [
+        threading.Thread(target=_write_feed, args=(w, data), daemon=True)
+        for (_, w), data in zip(pipes, feeds)
+    ]
+    for writer in writers:
+        writer.start()
+    
+    _, stderr = process.communicate()
+    for writer in writers:
+        writer.join()
+    
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
 
 
 class VideoAssembler:
@@ -29,14 +228,35 @@ class VideoAssembler:
         if not self.ffmpeg_available:
             print("WARNING: FFmpeg not found. Video assembly will not work.")
             print("Install with: brew install ffmpeg (macOS) or apt install ffmpeg (Linux)")
+        
+        self.mode = os.getenv("VIDEO_ASSEMBLY_MODE", MODE_SINGLE_PASS)
+        if self.mode not in ASSEMBLY_MODES:
+            print(f"[VIDEO ASSEMBLER] Unknown VIDEO_ASSEMBLY_MODE '{self.mode}', using {MODE_SINGLE_PASS}")
+            self.mode = MODE_SINGLE_PASS
+        # Pipes need pass_fds, which is POSIX-only
+        self.use_pipes = os.name == "posix"
+        
+        cpu_count = os.cpu_count() or 1
+        self.segment_parallelism = max(1, int(os.getenv("VIDEO_SEGMENT_PARALLELISM") or cpu_count))
+        # Split the cores between concurrent encoders instead of oversubscribing
+        self.segment_threads = max(1, cpu_count // self.segment_parallelism)
+        self._segment_slots = asyncio.Semaphore(self.segment_parallelism)
+        
+        # HLS rendition written alongside the MP4 by the same FFmpeg process
+        self.hls_enabled = os.getenv("VIDEO_HLS_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.hls_segment_seconds = float(os.getenv("HLS_SEGMENT_SECONDS", "2"))
+        # Posters and the scrub sprite, rendered next to the encode from the same slide images
+        self.previews_enabled = os.getenv("VIDEO_PREVIEWS_ENABLED", "true").lower() in ("1", "true", "yes")
     
     async def assemble_video(
         self,
         slides: List[SlideAssets],
-        output_filename: str = "lesson.mp4"
+        output_filename: str = "lesson.mp4",
+        mode: Optional[str] = None,
+        profile: str = DEFAULT_ENCODING_PROFILE
     ) -> Optional[str]:
         """
-        Assemble slides into a video.
+        Assemble slides into a video using the named encoding profile.
         Returns path to the output video file, or None if assembly fails.
         """
         if not self.ffmpeg_available:
@@ -47,6 +267,450 @@ class VideoAssembler:
             print("No slides provided")
             return None
         
+        if not any(slide.image_bytes for slide in slides):
+            print("[VIDEO ASSEMBLER] No valid images to assemble")
+            return None
+        
+        mode = mode or self.mode
+        encoding = ENCODING_PROFILES[profile]
+        started = time.perf_counter()
+        if mode == MODE_SINGLE_PASS:
+            assembly = self._assemble_single_pass(slides, output_filename, encoding)
+        elif mode == MODE_SEGMENTS:
+            assembly = self._assemble_segments(slides, output_filename, encoding)
+        else:
+            assembly = self._assemble_two_step(slides, output_filename, encoding)
+        result, _ = await asyncio.gather(
+            assembly, self.render_previews(slides, os.path.splitext(output_filename)[0])
+        )
+        print(f"[VIDEO ASSEMBLER] {mode}/{profile} assembly took {time.perf_counter() - started:.2f}s")
+        return result
+    
+    def _output_args(self, output_path: str, hls_partial: Optional[str]) -> List[str]:
+        """
+        Muxer arguments for a final encode: a faststart MP4 so playback can
+        begin before the download finishes, plus (via the tee muxer, with no
+        second encode) an HLS VOD playlist and segments when hls_partial is set.
+        All streams must already be mapped explicitly.
+        """
+        if not hls_partial:
+            return ["-movflags", "+faststart", "-f", "mp4", output_path]
+        
+        segment_path = os.path.join(hls_partial, HLS_SEGMENT_PATTERN.format(token=secrets.token_hex(4)))
+        playlist_path = os.path.join(hls_partial, HLS_PLAYLIST)
+        return [
+            "-f", "tee",
+            f"[f=mp4:movflags=+faststart]{output_path}"
+            f"|[f=hls:hls_time={self.hls_segment_seconds:g}:hls_playlist_type=vod"
+            f":hls_flags=independent_segments:hls_segment_filename={segment_path}]{playlist_path}"
+        ]
+    
+    def _begin_outputs(self, output_filename: str) -> Tuple[str, str, Optional[str]]:
+        """Create the output locations; returns (final_path, partial_path, hls_partial)."""
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        final_path = os.path.join(OUTPUT_DIR, output_filename)
+        partial_path = final_path + ".partial"
+        hls_partial = None
+        if self.hls_enabled:
+            hls_partial = hls_dir(os.path.splitext(output_filename)[0]) + ".partial"
+            shutil.rmtree(hls_partial, ignore_errors=True)
+            os.makedirs(hls_partial)
+        return final_path, partial_path, hls_partial
+    
+    def _commit_outputs(self, final_path: str, partial_path: str, hls_partial: Optional[str]):
+        """Move finished outputs into place, replacing any previous render, and index them."""
+        os.replace(partial_path, final_path)
+        get_media_index().register(final_path)
+        if hls_partial:
+            self._publish_dir(hls_partial)
+    
+    def _publish_dir(self, partial_dir: str):
+        """Swap a finished "<dir>.partial" in for "<dir>" and index its files."""
+        target = partial_dir[:-len(".partial")]
+        previous = target + ".old"
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.exists(target):
+            os.rename(target, previous)
+        os.rename(partial_dir, target)
+        get_media_index().register_tree(target)
+        shutil.rmtree(previous, ignore_errors=True)
+    
+    def _discard_outputs(self, partial_path: str, hls_partial: Optional[str]):
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        if hls_partial:
+            shutil.rmtree(hls_partial, ignore_errors=True)
+    
+    def _build_single_pass_args(
+        self,
+        slides: List[SlideAssets],
+        inputs: List[str],
+        output_path: str,
+        encoding: EncodingProfile,
+        include_audio: Optional[bool] = None,
+        threads: Optional[int] = None,
+        hls_partial: Optional[str] = None,
+        final: bool = True
+    ) -> List[str]:
+        """
+        Build one FFmpeg invocation whose filter graph loops each slide image
+        for the slide's duration, pads/trims its narration to match, and
+        concatenates everything. inputs holds one source per slide asset, in
+        order image then audio, for the assets that exist. include_audio
+        forces (or drops) the audio track; by default it is present when any
+        slide has narration. Final encodes get faststart (and HLS if
+        hls_partial is set); intermediate segments are plain MP4.
+        """
+        width, height = VIDEO_RESOLUTION
+        fps = encoding.fps
+        has_audio = any(slide.audio_bytes for slide in slides) if include_audio is None else include_audio
+        args = ["-y"]
+        filters = []
+        concat_inputs = []
+        input_index = 0
+        source = iter(inputs)
+        
+        for i, slide in enumerate(slides):
+            duration = f"{slide.duration_seconds:.6f}"
+            
+            if slide.image_bytes:
+                args += ["-f", "image2pipe", "-framerate", str(fps), "-i", next(source)]
+                filters.append(
+                    # Scale the still once, then repeat the converted frame
+                    f"[{input_index}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                    f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p,"
+                    f"loop=loop=-1:size=1:start=0,trim=duration={duration},"
+                    f"setpts=PTS-STARTPTS,fps={fps}[v{i}]"
+                )
+                input_index += 1
+            else:
+                filters.append(
+                    f"color=c=black:s={width}x{height}:r={fps}:d={duration},"
+                    f"setsar=1,format=yuv420p[v{i}]"
+                )
+            concat_inputs.append(f"[v{i}]")
+            
+            if not has_audio:
+                continue
+            if slide.audio_bytes:
+                args += ["-f", "mp3", "-i", next(source)]
+                filters.append(
+                    f"[{input_index}:a]aresample={AUDIO_SAMPLE_RATE},"
+                    f"aformat=channel_layouts=stereo,apad,atrim=duration={duration},"
+                    f"asetpts=PTS-STARTPTS[a{i}]"
+                )
+                input_index += 1
+            else:
+                filters.append(
+                    f"anullsrc=channel_layout=stereo:sample_rate={AUDIO_SAMPLE_RATE},"
+                    f"atrim=duration={duration}[a{i}]"
+                )
+            concat_inputs.append(f"[a{i}]")
+        
+        filters.append(
+            f"{''.join(concat_inputs)}concat=n={len(slides)}:v=1:a={1 if has_audio else 0}"
+            f"[outv]{'[outa]' if has_audio else ''}"
+        )
+        
+        args += ["-filter_complex", ";".join(filters), "-map", "[outv]"]
+        if has_audio:
+            args += ["-map", "[outa]"] + encoding.audio_args()
+        args += encoding.video_args()
+        if threads:
+            args += ["-threads", str(threads)]
+        if final:
+            args += self._output_args(output_path, hls_partial)
+        else:
+            args += ["-f", "mp4", output_path]
+        return args
+    
+    async def _encode(
+        self,
+        slides: List[SlideAssets],
+        output_path: str,
+        encoding: EncodingProfile,
+        include_audio: Optional[bool] = None,
+        threads: Optional[int] = None,
+        hls_partial: Optional[str] = None,
+        final: bool = True
+    ):
+        """
+        Encode slides with one FFmpeg process, streaming images and narration
+        in over pipes (or temp files where pipes are unavailable).
+        Raises subprocess.CalledProcessError if FFmpeg fails.
+        """
+        feeds = []
+        for slide in slides:
+            if slide.image_bytes:
+                feeds.append(slide.image_bytes)
+            if slide.audio_bytes and include_audio is not False:
+                feeds.append(slide.audio_bytes)
+        
+        await self._run_with_inputs(
+            feeds,
+            lambda inputs: self._build_single_pass_args(
+                slides, inputs, output_path, encoding, include_audio, threads, hls_partial, final
+            )
+        )
+    
+    async def _run_with_inputs(self, feeds: List[bytes], build_args: Callable[[List[str]], List[str]]):
+        """
+        Run FFmpeg with build_args(inputs), where inputs name each feed as a
+        pipe, or as a temp file where pipes are unavailable.
+        """
+        if self.use_pipes:
+            inputs = [f"{{feed{i}}}" for i in range(len(feeds))]
+            await asyncio.to_thread(run_ffmpeg, build_args(inputs), feeds)
+            return
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inputs = []
+            for i, data in enumerate(feeds):
+                path = os.path.join(temp_dir, f"input_{i}")
+                with open(path, "wb") as f:
+                    f.write(data)
+                inputs.append(path)
+            await asyncio.to_thread(run_ffmpeg, build_args(inputs))
+    
+    def _build_preview_args(
+        self,
+        poster_index: int,
+        tile_counts: List[int],
+        slides: List[SlideAssets],
+        inputs: List[str],
+        out_dir: str
+    ) -> List[str]:
+        """
+        One FFmpeg invocation, fed the still slide images (no video decode),
+        that writes the poster (slide poster_index) at every THUMBNAIL_WIDTHS
+        size in each THUMBNAIL_FORMATS, plus the sprite sheet: tile_counts[i]
+        tiles of slide i, PREVIEW_COLUMNS per row. inputs holds one source
+        per slide image that is used, in slide order.
+        """
+        width, height = VIDEO_RESOLUTION
+        tile_width, tile_height = _tile_size()
+        args = ["-y"]
+        filters = []
+        labels = {}
+        source = iter(inputs)
+        for i, slide in enumerate(slides):
+            if slide.image_bytes and (tile_counts[i] or i == poster_index):
+                args += ["-f", "image2pipe", "-i", next(source)]
+                labels[i] = f"[{len(labels)}:v]"
+        
+        poster_label = labels[poster_index]
+        if tile_counts[poster_index]:
+            filters.append(f"{poster_label}split=2[poster][tile_src]")
+            poster_label, labels[poster_index] = "[poster]", "[tile_src]"
+        
+        tiles = []
+        for i, count in enumerate(tile_counts):
+            if not count:
+                continue
+            if i in labels:
+                filters.append(
+                    f"{labels[i]}scale={tile_width}:{tile_height}:force_original_aspect_ratio=decrease,"
+                    f"pad={tile_width}:{tile_height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                    f"loop=loop={count - 1}:size=1:start=0,setpts=N[t{i}]"
+                )
+            else:
+                filters.append(
+                    f"color=c=black:s={tile_width}x{tile_height},trim=end_frame={count},setsar=1,setpts=N[t{i}]"
+                )
+            tiles.append(f"[t{i}]")
+        
+        total_tiles = sum(tile_counts)
+        filters.append(
+            f"{''.join(tiles)}concat=n={len(tiles)}:v=1:a=0,"
+            f"tile={min(PREVIEW_COLUMNS, total_tiles)}x{math.ceil(total_tiles / PREVIEW_COLUMNS)},"
+            f"format=yuvj420p[sprite]"
+        )
+        
+        filters.append(
+            f"{poster_label}scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,split={len(THUMBNAIL_WIDTHS)}"
+            + "".join(f"[poster{w}]" for w in THUMBNAIL_WIDTHS)
+        )
+        outputs = []
+        for w in THUMBNAIL_WIDTHS:
+            filters.append(
+                f"[poster{w}]scale={w}:-2,split={len(THUMBNAIL_FORMATS)}"
+                + "".join(f"[poster{w}{ext}]" for ext in THUMBNAIL_FORMATS)
+            )
+            for ext in THUMBNAIL_FORMATS:
+                if ext == "jpg":
+                    codec = ["-c:v", "mjpeg", "-q:v", "4"]
+                    filters.append(f"[poster{w}{ext}]format=yuvj420p[out{w}{ext}]")
+                else:
+                    codec = ["-c:v", "libwebp", "-quality", "80"]
+                    filters.append(f"[poster{w}{ext}]format=yuv420p[out{w}{ext}]")
+                outputs += [
+                    "-map", f"[out{w}{ext}]", "-frames:v", "1", *codec,
+                    os.path.join(out_dir, POSTER_PATTERN.format(width=w, ext=ext))
+                ]
+        
+        args += ["-filter_complex", ";".join(filters), *outputs]
+        args += ["-map", "[sprite]", "-frames:v", "1", "-c:v", "mjpeg", "-q:v", "4",
+                 os.path.join(out_dir, SPRITE_IMAGE)]
+        return args
+    
+    async def render_previews(self, slides: List[SlideAssets], video_id: str) -> bool:
+        """
+        Render posters and the seek-preview sprite + WebVTT index for a video
+        into previews_dir(video_id). Runs from the slide stills, so it can go
+        alongside the encode instead of decoding the finished MP4.
+        """
+        if not self.previews_enabled or not self.ffmpeg_available:
+            return False
+        if not any(slide.image_bytes for slide in slides):
+            return False
+        
+        out_dir = previews_dir(video_id)
+        partial_dir = out_dir + ".partial"
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        os.makedirs(partial_dir)
+        durations = [slide.duration_seconds for slide in slides]
+        interval, tile_counts = preview_tiles(durations)
+        
+        poster_index = next(i for i, slide in enumerate(slides) if slide.image_bytes)
+        feeds = [
+            slide.image_bytes for i, slide in enumerate(slides)
+            if slide.image_bytes and (tile_counts[i] or i == poster_index)
+        ]
+        
+        try:
+            await self._run_with_inputs(
+                feeds,
+                lambda inputs: self._build_preview_args(poster_index, tile_counts, slides, inputs, partial_dir)
+            )
+            with open(os.path.join(partial_dir, SPRITE_IMAGE), "rb") as f:
+                # Versioned by content, so the VTT can point at an immutable URL
+                sprite_version = hashlib.sha256(f.read()).hexdigest()[:12]
+            with open(os.path.join(partial_dir, SPRITE_VTT), "w") as f:
+                f.write(build_sprite_vtt(
+                    sum(durations), interval, sum(tile_counts), f"{SPRITE_IMAGE}?v={sprite_version}"
+                ))
+            self._publish_dir(partial_dir)
+            return True
+            
+        except subprocess.CalledProcessError as e:
+            print(f"[VIDEO ASSEMBLER] Preview render failed: {e.stderr.decode() if e.stderr else str(e)}")
+        except Exception as e:
+            print(f"[VIDEO ASSEMBLER] Preview render failed: {e}")
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        return False
+    
+    async def _assemble_single_pass(
+        self,
+        slides: List[SlideAssets],
+        output_filename: str,
+        encoding: EncodingProfile
+    ) -> Optional[str]:
+        """
+        Assemble with a single FFmpeg process. The encode is written next
+        to its final location, then renamed into place.
+        """
+        final_path, partial_path, hls_partial = self._begin_outputs(output_filename)
+        
+        try:
+            await self._encode(slides, partial_path, encoding, hls_partial=hls_partial)
+            self._commit_outputs(final_path, partial_path, hls_partial)
+            return final_path
+            
+        except subprocess.CalledProcessError as e:
+            print(f"FFmpeg error: {e.stderr.decode() if e.stderr else str(e)}")
+        except Exception as e:
+            print(f"Video assembly error: {e}")
+        
+        self._discard_outputs(partial_path, hls_partial)
+        return None
+    
+    async def encode_segment(
+        self,
+        slide: SlideAssets,
+        output_path: str,
+        profile: str = DEFAULT_ENCODING_PROFILE
+    ):
+        """
+        Encode one slide into a standalone MP4 segment. Every segment carries
+        an audio track (silence if there is no narration) so segments can be
+        joined by stream copy; segments to be joined must share a profile.
+        Concurrency is capped by VIDEO_SEGMENT_PARALLELISM.
+        Raises subprocess.CalledProcessError if FFmpeg fails.
+        """
+        encoding = ENCODING_PROFILES[profile]
+        async with self._segment_slots:
+            await self._encode(
+                [slide], output_path, encoding,
+                include_audio=True, threads=self.segment_threads, final=False
+            )
+    
+    async def concat_segments(self, segment_paths: List[str], output_filename: str) -> Optional[str]:
+        """Join encoded segments with a stream-copy concat. No re-encode happens."""
+        final_path, partial_path, hls_partial = self._begin_outputs(output_filename)
+        list_fd, list_path = tempfile.mkstemp(suffix=".txt")
+        
+        try:
+            with os.fdopen(list_fd, "w") as f:
+                for path in segment_paths:
+                    f.write(f"file '{path}'\n")
+            
+            await asyncio.to_thread(run_ffmpeg, [
+                "-y",
+                "-f", "concat", "-safe", "0",
+                "-i", list_path,
+                "-map", "0",
+                "-c", "copy",
+                *self._output_args(partial_path, hls_partial)
+            ])
+            self._commit_outputs(final_path, partial_path, hls_partial)
+            return final_path
+            
+        except subprocess.CalledProcessError as e:
+            print(f"FFmpeg concat error: {e.stderr.decode() if e.stderr else str(e)}")
+        except Exception as e:
+            print(f"Segment concat error: {e}")
+        finally:
+            os.remove(list_path)
+        
+        self._discard_outputs(partial_path, hls_partial)
+        return None
+    
+    async def _assemble_segments(
+        self,
+        slides: List[SlideAssets],
+        output_filename: str,
+        encoding: EncodingProfile
+    ) -> Optional[str]:
+        """Encode every slide as its own segment concurrently, then concat."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            segment_paths = [
+                os.path.join(temp_dir, f"segment_{i:03d}.mp4") for i in range(len(slides))
+            ]
+            
+            results = await asyncio.gather(
+                *[
+                    self.encode_segment(slide, path, encoding.name)
+                    for slide, path in zip(slides, segment_paths)
+                ],
+                return_exceptions=True
+            )
+            for slide, result in zip(slides, results):
+                if isinstance(result, Exception):
+                    detail = result.stderr.decode() if isinstance(result, subprocess.CalledProcessError) and result.stderr else str(result)
+                    print(f"[VIDEO ASSEMBLER] Segment for slide {slide.slide_number} failed: {detail}")
+                    return None
+            
+            return await self.concat_segments(segment_paths, output_filename)
+    
+    async def _assemble_two_step(
+        self,
+        slides: List[SlideAssets],
+        output_filename: str,
+        encoding: EncodingProfile
+    ) -> Optional[str]:
+        """Assemble by concatenating audio first, then encoding the video."""
+        output_path, hls_partial = None, None
         try:
             # Create temp directory for assets
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -103,7 +767,7 @@ class VideoAssembler:
                         f.write(f"file '{audio_path}'\n")
                 
                 combined_audio = os.path.join(temp_dir, "combined_audio.mp3")
-                output_path = os.path.join(temp_dir, output_filename)
+                final_path, output_path, hls_partial = self._begin_outputs(output_filename)
                 
                 has_audio = len(valid_audio_paths) > 0
                 
@@ -133,11 +797,12 @@ class VideoAssembler:
                         "-f", "concat", "-safe", "0",
                         "-i", concat_file,
                         "-i", combined_audio,
-                        "-c:v", "libx264",
-                        "-pix_fmt", "yuv420p",
-                        "-c:a", "aac",
+                        "-map", "0:v", "-map", "1:a",
+                        "-r", str(encoding.fps),
+                        *encoding.video_args(),
+                        *encoding.audio_args(),
                         "-shortest",
-                        output_path
+                        *self._output_args(output_path, hls_partial)
                     ]
                 else:
                     # No audio - just create video from images
@@ -146,9 +811,10 @@ class VideoAssembler:
                         "ffmpeg", "-y",
                         "-f", "concat", "-safe", "0",
                         "-i", concat_file,
-                        "-c:v", "libx264",
-                        "-pix_fmt", "yuv420p",
-                        output_path
+                        "-map", "0:v",
+                        "-r", str(encoding.fps),
+                        *encoding.video_args(),
+                        *self._output_args(output_path, hls_partial)
                     ]
                 
                 await asyncio.to_thread(
@@ -156,22 +822,19 @@ class VideoAssembler:
                     capture_output=True, check=True
                 )
                 
-                # Read the output video
+                # Move the output video to its permanent location
                 if os.path.exists(output_path):
-                    # Copy to a permanent location
-                    final_path = os.path.join(os.getcwd(), "output", output_filename)
-                    os.makedirs(os.path.dirname(final_path), exist_ok=True)
-                    shutil.copy2(output_path, final_path)
+                    self._commit_outputs(final_path, output_path, hls_partial)
                     return final_path
                 
-                return None
-                
         except subprocess.CalledProcessError as e:
             print(f"FFmpeg error: {e.stderr.decode() if e.stderr else str(e)}")
-            return None
         except Exception as e:
             print(f"Video assembly error: {e}")
-            return None
+        
+        if output_path:
+            self._discard_outputs(output_path, hls_partial)
+        return None
 
 
 # Singleton instance
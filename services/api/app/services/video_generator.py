@@ -17,8 +17,12 @@ from ..models.video import (
     VideoResponse,
     Slide,
 )
+from .circuit_breaker import call_provider
+from .provider_governor import GEMINI_TEXT
 
 
+SCRIPT_MODEL = "gemini-2.0-flash-lite"
+
 # System prompt for video script generation
 VIDEO_SYSTEM_PROMPT = """You are an educational video script writer for biology lessons.
 Create engaging, grade-appropriate content for short video lessons.
@@ -118,7 +122,7 @@ class VideoScriptGenerator:
         else:
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel(
-                model_name="gemini-2.0-flash-lite",
+                model_name=SCRIPT_MODEL,
                 system_instruction=VIDEO_SYSTEM_PROMPT
             )
     
@@ -138,9 +142,9 @@ class VideoScriptGenerator:
                 "response_mime_type": "application/json",
             }
             
-            response = await self.model.generate_content_async(
-                prompt,
-                generation_config=generation_config
+            response = await call_provider(
+                GEMINI_TEXT, SCRIPT_MODEL,
+                lambda: self.model.generate_content_async(prompt, generation_config=generation_config)
             )
             
             content = response.text
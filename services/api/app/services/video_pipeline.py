@@ -0,0 +1,337 @@
+"""
+Video Generation Pipeline
+Script -> images + narration -> FFmpeg assembly, and single-slide re-renders,
+run by the background job workers
+"""
+import asyncio
+import os
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.video import Slide, VideoManifest, VideoRequest, VideoResponse, VideoScript
+from .video_generator import get_video_script_generator
+from .image_generator import get_image_generator
+from .tts_generator import get_tts_generator
+from .video_assembler import (
+    HLS_PLAYLIST,
+    POSTER_PATTERN,
+    SPRITE_VTT,
+    THUMBNAIL_WIDTHS,
+    SlideAssets,
+    get_video_assembler,
+    hls_dir,
+    previews_dir,
+)
+from .video_store import get_video_store
+
+
+VIDEO_JOB_KIND = "generate_video"
+SLIDE_RERENDER_JOB_KIND = "rerender_slide"
+
+PIPELINED = os.getenv("VIDEO_PIPELINED", "true").lower() in ("1", "true", "yes")
+
+
+async def _encode_segment(assets: SlideAssets, segment_path: str, profile: str) -> bool:
+    """Encode a slide's segment into place; a failed encode leaves no file behind."""
+    partial_path = segment_path + ".partial"
+    os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+    try:
+        await get_video_assembler().encode_segment(assets, partial_path, profile)
+        os.replace(partial_path, segment_path)
+        return True
+    except Exception as e:
+        detail = e.stderr.decode() if isinstance(e, subprocess.CalledProcessError) and e.stderr else str(e)
+        print(f"[VIDEO] Segment for slide {assets.slide_number} failed: {detail}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        return False
+
+
+async def _produce_slide(
+    slide: Slide,
+    index: int,
+    video_id: str,
+    profile: str
+) -> Tuple[SlideAssets, bool]:
+    """
+    Carry one slide from prompts to an encoded segment, independently of
+    the others. Returns the slide's assets and whether its segment encoded.
+    """
+    image_bytes, (audio_bytes, duration) = await asyncio.gather(
+        get_image_generator().generate_image(slide.imagePrompt, index),
+        get_tts_generator().generate_audio(slide.narration)
+    )
+    assets = SlideAssets(
+        slide_number=slide.slideNumber,
+        image_bytes=image_bytes,
+        audio_bytes=audio_bytes,
+        duration_seconds=duration if duration > 0 else 5.0
+    )
+    store = get_video_store()
+    store.save_slide_assets(video_id, index, assets)
+    encoded = await _encode_segment(assets, store.segment_path(video_id, index), profile)
+    return assets, encoded
+
+
+async def _assemble_pipelined(
+    script: VideoScript,
+    request: VideoRequest,
+    video_id: str
+) -> Tuple[Optional[str], List[SlideAssets]]:
+    """Per-slide image/audio/encode, then one concat once every segment is done."""
+    assembler = get_video_assembler()
+    store = get_video_store()
+    started = time.perf_counter()
+    
+    tasks = [
+        asyncio.create_task(_produce_slide(slide, i, video_id, request.encodingProfile))
+        for i, slide in enumerate(script.slides)
+    ]
+    
+    try:
+        for finished in asyncio.as_completed(tasks):
+            assets, _ = await finished
+            print(f"[VIDEO] Slide {assets.slide_number} ready after {time.perf_counter() - started:.2f}s")
+    finally:
+        # One slide failed (or the job was cancelled): stop the rest instead of leaking them
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+    
+    results = [task.result() for task in tasks]
+    slides = [assets for assets, _ in results]
+    
+    video_path = None
+    if all(encoded for _, encoded in results):
+        segment_paths = [store.segment_path(video_id, i) for i in range(len(slides))]
+        video_path, _ = await asyncio.gather(
+            assembler.concat_segments(segment_paths, f"{video_id}.mp4"),
+            assembler.render_previews(slides, video_id)
+        )
+    
+    if video_path is None:
+        print("[VIDEO] Pipelined assembly failed, re-assembling from slide assets")
+        video_path = await assembler.assemble_video(
+            slides, f"{video_id}.mp4", profile=request.encodingProfile
+        )
+    
+    print(f"[VIDEO] Pipelined assembly finished in {time.perf_counter() - started:.2f}s")
+    return video_path, slides
+
+
+async def _assemble_after_gather(
+    script: VideoScript,
+    request: VideoRequest,
+    video_id: str
+) -> Tuple[Optional[str], List[SlideAssets]]:
+    """Generate every image and clip first, then assemble in one step (no segments are kept)."""
+    image_generator = get_image_generator()
+    tts_generator = get_tts_generator()
+
+    # Extract prompts and narrations
+    image_prompts = [slide.imagePrompt for slide in script.slides]
+    narration_texts = [slide.narration for slide in script.slides]
+
+    print(f"[VIDEO] Generating {len(image_prompts)} images and {len(narration_texts)} audio clips...")
+
+    images_task = image_generator.generate_slide_images(image_prompts)
+    audio_task = tts_generator.generate_slide_narrations(narration_texts)
+
+    images, audio_results = await asyncio.gather(images_task, audio_task)
+
+    # Log results
+    images_success = sum(1 for img in images if img is not None)
+    audio_success = sum(1 for aud, _ in audio_results if aud is not None)
+    print(f"[VIDEO] Images generated: {images_success}/{len(images)}")
+    print(f"[VIDEO] Audio clips generated: {audio_success}/{len(audio_results)}")
+
+    slides: List[SlideAssets] = []
+    store = get_video_store()
+
+    for i, slide in enumerate(script.slides):
+        audio_bytes, duration = audio_results[i] if i < len(audio_results) else (None, 5.0)
+        assets = SlideAssets(
+            slide_number=slide.slideNumber,
+            image_bytes=images[i] if i < len(images) else None,
+            audio_bytes=audio_bytes,
+            duration_seconds=duration if duration > 0 else 5.0
+        )
+        store.save_slide_assets(video_id, i, assets)
+        slides.append(assets)
+
+    assembler = get_video_assembler()
+    video_path = await assembler.assemble_video(
+        slides, f"{video_id}.mp4", profile=request.encodingProfile
+    )
+    return video_path, slides
+
+
+def _video_response(manifest: VideoManifest, video_path: Optional[str]) -> VideoResponse:
+    video_id = manifest.videoId
+    # TODO: Upload to Firebase Storage and get public URL
+    # For now, serve it from the API's media routes
+    video_url = f"/api/videos/{video_id}/stream" if video_path else ""
+    has_hls = video_path and os.path.exists(os.path.join(hls_dir(video_id), HLS_PLAYLIST))
+    hls_url = f"/api/videos/{video_id}/hls/{HLS_PLAYLIST}" if has_hls else ""
+    
+    # Preview URLs carry the manifest version so they can be cached as immutable
+    thumbnail_url = preview_url = ""
+    poster = POSTER_PATTERN.format(width=min(THUMBNAIL_WIDTHS, key=lambda w: abs(w - 640)), ext="webp")
+    if video_path and os.path.exists(os.path.join(previews_dir(video_id), poster)):
+        thumbnail_url = f"/api/videos/{video_id}/previews/{poster}?v={manifest.version}"
+        preview_url = f"/api/videos/{video_id}/previews/{SPRITE_VTT}?v={manifest.version}"
+
+    return VideoResponse(
+        videoId=video_id,
+        title=manifest.script.title,
+        videoUrl=video_url,
+        thumbnailUrl=thumbnail_url,
+        durationSeconds=sum(manifest.durations),
+        hlsUrl=hls_url,
+        previewUrl=preview_url
+    )
+
+
+async def generate_video_lesson(
+    request: VideoRequest,
+    video_id: str,
+    owner_uid: str = ""
+) -> VideoResponse:
+    """
+    Generate a video lesson from the given topic.
+
+    Pipeline:
+    1. Generate script via Gemini
+    2. Generate images via NanoBanana (parallel)
+    3. Generate TTS audio via ElevenLabs (parallel)
+    4. Assemble video via FFmpeg
+
+    With VIDEO_PIPELINED (the default) steps 2-4 run per slide: each slide
+    is encoded as soon as its own image and narration exist, and the final
+    stream-copy concat starts when the last segment lands.
+    """
+    # Step 1: Generate script
+    print(f"[VIDEO] Starting video generation for topic: {request.topic}")
+    script_generator = get_video_script_generator()
+    script = await script_generator.generate_script(request)
+    print(f"[VIDEO] Script generated: {script.title} with {len(script.slides)} slides")
+
+    if PIPELINED:
+        video_path, slides = await _assemble_pipelined(script, request, video_id)
+    else:
+        video_path, slides = await _assemble_after_gather(script, request, video_id)
+
+    print(f"[VIDEO] Assembly result: {video_path}")
+
+    manifest = VideoManifest(
+        videoId=video_id,
+        ownerUid=owner_uid,
+        request=request,
+        script=script,
+        durations=[assets.duration_seconds for assets in slides],
+        updatedAt=datetime.now(timezone.utc)
+    )
+    if video_path:
+        get_video_store().save_manifest(manifest)
+
+    # TODO: Save to Firestore
+
+    return _video_response(manifest, video_path)
+
+
+async def rerender_slide(video_id: str, slide: Slide) -> VideoResponse:
+    """
+    Replace one slide of an existing video. Only assets whose prompt or
+    narration changed are regenerated, only that slide's segment is
+    re-encoded, and the video is re-joined by stream copy.
+    """
+    store = get_video_store()
+    async with store.lock(video_id):
+        manifest = store.load_manifest(video_id)
+        if manifest is None:
+            raise ValueError(f"Video {video_id} has no stored script")
+        
+        index = next(
+            (i for i, existing in enumerate(manifest.script.slides) if existing.slideNumber == slide.slideNumber),
+            None
+        )
+        if index is None:
+            raise ValueError(f"Video {video_id} has no slide {slide.slideNumber}")
+        
+        started = time.perf_counter()
+        previous = manifest.script.slides[index]
+        assets = store.load_slide_assets(video_id, index, manifest)
+        
+        image_changed = slide.imagePrompt != previous.imagePrompt or assets.image_bytes is None
+        narration_changed = slide.narration != previous.narration or assets.audio_bytes is None
+        image_task = get_image_generator().generate_image(slide.imagePrompt, index) if image_changed else None
+        audio_task = get_tts_generator().generate_audio(slide.narration) if narration_changed else None
+        
+        if image_task or audio_task:
+            results = await asyncio.gather(*[task for task in (image_task, audio_task) if task])
+            image_bytes = results.pop(0) if image_task else assets.image_bytes
+            audio_bytes, duration = results.pop(0) if audio_task else (assets.audio_bytes, assets.duration_seconds)
+            assets = SlideAssets(
+                slide_number=slide.slideNumber,
+                image_bytes=image_bytes,
+                audio_bytes=audio_bytes,
+                duration_seconds=duration if duration > 0 else 5.0
+            )
+        print(f"[VIDEO] Re-rendering slide {slide.slideNumber} of {video_id} "
+              f"(image {'new' if image_changed else 'kept'}, narration {'new' if narration_changed else 'kept'})")
+        store.save_slide_assets(video_id, index, assets)
+        
+        # Loaded once: feeds both the segment encodes and the previews
+        slides = [
+            assets if i == index else store.load_slide_assets(video_id, i, manifest)
+            for i in range(len(manifest.script.slides))
+        ]
+        
+        # The edited slide, plus any slide without a kept segment
+        # (videos assembled on the barrier path), is encoded from stored assets
+        profile = manifest.request.encodingProfile
+        segment_paths = [store.segment_path(video_id, i) for i in range(len(manifest.script.slides))]
+        to_encode = [
+            (slides[i], path)
+            for i, path in enumerate(segment_paths)
+            if i == index or not os.path.exists(path)
+        ]
+        encoded = await asyncio.gather(*[
+            _encode_segment(slide_assets, path, profile) for slide_assets, path in to_encode
+        ])
+        if not all(encoded):
+            raise RuntimeError(f"Segment encode failed while re-rendering {video_id}")
+        
+        assembler = get_video_assembler()
+        video_path, _ = await asyncio.gather(
+            assembler.concat_segments(segment_paths, f"{video_id}.mp4"),
+            assembler.render_previews(slides, video_id)
+        )
+        if video_path is None:
+            raise RuntimeError(f"Re-joining segments failed for {video_id}")
+        
+        # Only publish the new version once its video exists
+        manifest.script.slides[index] = slide
+        manifest.durations[index] = assets.duration_seconds
+        manifest.version += 1
+        manifest.updatedAt = datetime.now(timezone.utc)
+        store.save_manifest(manifest)
+        print(f"[VIDEO] Slide {slide.slideNumber} of {video_id} re-rendered in {time.perf_counter() - started:.2f}s")
+        
+        return _video_response(manifest, video_path)
+
+
+async def run_video_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: rebuild the request from the payload and run the pipeline."""
+    request = VideoRequest(**payload["request"])
+    response = await generate_video_lesson(request, payload["videoId"], payload.get("ownerUid", ""))
+    return response.model_dump()
+
+
+async def run_slide_rerender_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler for PUT /videos/{videoId}/slides/{n}."""
+    response = await rerender_slide(payload["videoId"], Slide(**payload["slide"]))
+    return response.model_dump()
@@ -0,0 +1,123 @@
+"""
+Video Store
+Per-video workspace under OUTPUT_DIR/{videoId}/ holding the script manifest
+and every slide's image, narration and encoded segment, so one slide can be
+re-rendered without regenerating the rest
+"""
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from ..models.video import VideoManifest
+from .video_assembler import SlideAssets, video_asset_dir
+
+
+MANIFEST_FILE = "video.json"
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write next to the target and rename, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".partial")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class _VideoLock:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        # Holders plus waiters; the lock is dropped when this reaches zero
+        self.users = 0
+
+
+class VideoStore:
+    """Reads and writes the workspace files of generated videos."""
+
+    def __init__(self):
+        self._locks: Dict[str, _VideoLock] = {}
+
+    @asynccontextmanager
+    async def lock(self, video_id: str) -> AsyncIterator[None]:
+        """Serializes re-renders of the same video."""
+        entry = self._locks.get(video_id)
+        if entry is None:
+            entry = self._locks[video_id] = _VideoLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del self._locks[video_id]
+
+    def _path(self, video_id: str, *parts: str) -> str:
+        return os.path.join(video_asset_dir(video_id), *parts)
+
+    def segment_path(self, video_id: str, index: int) -> str:
+        return self._path(video_id, "segments", f"segment_{index:03d}.mp4")
+
+    def _image_path(self, video_id: str, index: int) -> str:
+        return self._path(video_id, "slides", f"slide_{index:03d}.img")
+
+    def _audio_path(self, video_id: str, index: int) -> str:
+        return self._path(video_id, "slides", f"slide_{index:03d}.mp3")
+
+    def save_slide_assets(self, video_id: str, index: int, assets: SlideAssets):
+        """Keep a slide's source image and narration for later re-renders."""
+        for path, data in (
+            (self._image_path(video_id, index), assets.image_bytes),
+            (self._audio_path(video_id, index), assets.audio_bytes),
+        ):
+            if data:
+                _write_atomic(path, data)
+            elif os.path.exists(path):
+                os.remove(path)
+
+    def load_slide_assets(self, video_id: str, index: int, manifest: VideoManifest) -> SlideAssets:
+        duration = manifest.durations[index] if index < len(manifest.durations) else 5.0
+        return SlideAssets(
+            slide_number=manifest.script.slides[index].slideNumber,
+            image_bytes=_read(self._image_path(video_id, index)),
+            audio_bytes=_read(self._audio_path(video_id, index)),
+            duration_seconds=duration
+        )
+
+    def save_manifest(self, manifest: VideoManifest):
+        _write_atomic(
+            self._path(manifest.videoId, MANIFEST_FILE),
+            manifest.model_dump_json().encode()
+        )
+
+    def load_manifest(self, video_id: str) -> Optional[VideoManifest]:
+        data = _read(self._path(video_id, MANIFEST_FILE))
+        if data is None:
+            return None
+        return VideoManifest.model_validate_json(data)
+
+
+# Singleton instance
+_video_store: Optional[VideoStore] = None
+
+
+def get_video_store() -> VideoStore:
+    """Get singleton video store instance."""
+    global _video_store
+    if _video_store is None:
+        _video_store = VideoStore()
+    return _video_store
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Backfill the denormalized summary fields (title) onto existing lesson
+documents so the library can be listed from the summary projection alone.
+
+    python backfill_lesson_summaries.py [--batch-size 200] [--dry-run]
+
+Documents are walked in ID order and written in batches. The last processed
+ID is checkpointed after every batch, so an interrupted run resumes where it
+stopped; documents that are already up to date are skipped, so rerunning from
+scratch is also safe.
+"""
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from google.api_core.exceptions import FailedPrecondition
+
+from app.repositories.firestore import LessonRepository, summary_fields
+from app.services.auth import get_firestore_client
+
+# Firestore rejects batches with more than 500 writes
+MAX_BATCH_SIZE = 500
+
+
+def read_checkpoint(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def write_checkpoint(path: str, lesson_id: str):
+    with open(path, "w") as f:
+        f.write(lesson_id)
+
+
+def backfill_page(db, docs, dry_run: bool) -> int:
+    """Write stale summaries for one page of documents; returns how many changed."""
+    batch = db.batch()
+    stale = 0
+    for doc in docs:
+        data = doc.to_dict()
+        fields = summary_fields(data.get("lessonPlanJson") or {})
+        if all(data.get(key) == value for key, value in fields.items()):
+            continue
+        # Fails the batch if the lesson was edited since it was read, instead
+        # of overwriting a fresh summary with a stale one
+        batch.update(doc.reference, fields, option=db.write_option(last_update_time=doc.update_time))
+        stale += 1
+    if stale and not dry_run:
+        batch.commit()
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--checkpoint", default=".backfill_lesson_summaries", help="file holding the last processed ID")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first document")
+    parser.add_argument("--dry-run", action="store_true", help="count stale documents without writing")
+    parser.add_argument("--max-retries", type=int, default=5, help="attempts per batch when lessons change underneath it")
+    args = parser.parse_args()
+    batch_size = max(1, min(args.batch_size, MAX_BATCH_SIZE))
+
+    db = get_firestore_client()
+    collection = db.collection(LessonRepository.COLLECTION)
+    start_after = "" if args.restart or args.dry_run else read_checkpoint(args.checkpoint)
+    if start_after:
+        print(f"→ Resuming after {start_after}")
+
+    scanned = updated = 0
+    while True:
+        query = collection.order_by("__name__").select(["lessonPlanJson.title", "title"]).limit(batch_size)
+        if start_after:
+            query = query.start_after({"__name__": start_after})
+
+        for attempt in range(1, args.max_retries + 1):
+            docs = list(query.stream())
+            try:
+                stale = backfill_page(db, docs, args.dry_run)
+                break
+            except FailedPrecondition:
+                print(f"⚠ A lesson changed during the batch; rereading (attempt {attempt}/{args.max_retries})")
+        else:
+            print(f"❌ ERROR: Giving up on the batch after {start_after or 'the start'}; rerun to resume")
+            raise SystemExit(1)
+
+        if not docs:
+            break
+        scanned += len(docs)
+        updated += stale
+        start_after = docs[-1].id
+        if not args.dry_run:
+            write_checkpoint(args.checkpoint, start_after)
+        print(f"  {scanned} scanned, {updated} {'stale' if args.dry_run else 'updated'} (last {start_after})")
+
+    print(f"✅ Done: {scanned} lessons scanned, {updated} {'need a backfill' if args.dry_run else 'backfilled'}")
+    if not args.dry_run and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark video assembly modes on placeholder slides with synthetic narration."""
+import argparse
+import asyncio
+import os
+import subprocess
+import tempfile
+import time
+
+# Keep benchmark output out of the real output directory
+os.environ.setdefault("VIDEO_OUTPUT_DIR", tempfile.mkdtemp(prefix="bench_assembly_"))
+
+from app.services.image_generator import PLACEHOLDER_COLORS, PLACEHOLDER_SIZE, render_placeholder_png
+from app.services.video_assembler import (
+    ASSEMBLY_MODES,
+    MODE_TWO_STEP,
+    SlideAssets,
+    get_video_assembler,
+)
+
+
+def synth_narration(seconds: float) -> bytes:
+    """A sine tone encoded like ElevenLabs output (44.1 kHz, 128 kbps MP3)."""
+    result = subprocess.run(
+        [
+            "ffmpeg", "-v", "error",
+            "-f", "lavfi", "-i", f"sine=frequency=220:duration={seconds}",
+            "-ar", "44100", "-ac", "2", "-b:a", "128k", "-f", "mp3", "pipe:1"
+        ],
+        capture_output=True, check=True
+    )
+    return result.stdout
+
+
+def build_slides(count: int, seconds: float):
+    audio = synth_narration(seconds)
+    width, height = PLACEHOLDER_SIZE
+    return [
+        SlideAssets(
+            slide_number=i + 1,
+            image_bytes=render_placeholder_png(PLACEHOLDER_COLORS[i % len(PLACEHOLDER_COLORS)], width, height),
+            audio_bytes=audio,
+            duration_seconds=seconds
+        )
+        for i in range(count)
+    ]
+
+
+async def run(args):
+    assembler = get_video_assembler()
+    if not assembler.ffmpeg_available:
+        print("❌ ERROR: ffmpeg not found on PATH")
+        return
+
+    print(f"→ {args.slides} slides x {args.seconds}s, {os.cpu_count()} CPU(s), "
+          f"segment parallelism {assembler.segment_parallelism}")
+    slides = build_slides(args.slides, args.seconds)
+
+    timings = {}
+    for mode in ASSEMBLY_MODES:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            path = await assembler.assemble_video(slides, f"bench_{mode}.mp4", mode=mode)
+            elapsed = time.perf_counter() - start
+            if path is None:
+                print(f"❌ {mode} failed")
+                break
+            best = min(best, elapsed)
+            os.remove(path)
+        timings[mode] = best
+
+    baseline = timings[MODE_TWO_STEP]
+    print(f"\n{'mode':<14}{'seconds':>10}{'speedup':>10}")
+    for mode, seconds in timings.items():
+        print(f"{mode:<14}{seconds:>10.2f}{baseline / seconds:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=15.0, help="narration length per slide")
+    parser.add_argument("--repeat", type=int, default=2, help="best of N runs per mode")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
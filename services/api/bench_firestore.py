@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent lesson reads against the Firestore emulator: the old
+blocking client calls versus the async repository.
+
+    firebase emulators:start --only firestore   # or gcloud beta emulators firestore start
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python bench_firestore.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+if not os.getenv("FIRESTORE_EMULATOR_HOST"):
+    print("⏭  FIRESTORE_EMULATOR_HOST is not set; start the Firestore emulator to run this benchmark")
+    sys.exit(0)
+
+from google.cloud import firestore
+
+from app.models.lesson import GenerateRequest
+from app.repositories.firestore import LessonRepository
+from app.services.generator import get_fallback_lesson_plan
+
+OWNER = "bench-owner"
+
+
+async def loop_lag(stop: asyncio.Event, samples: list):
+    """Record how late a 5 ms timer fires; blocking calls show up as large lags."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append(time.perf_counter() - started - 0.005)
+
+
+async def measure(label: str, read, lesson_ids, concurrency: int) -> dict:
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(lesson_id: str):
+        async with limit:
+            began = time.perf_counter()
+            await read(lesson_id)
+            latencies.append(time.perf_counter() - began)
+
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(loop_lag(stop, lags))
+    began = time.perf_counter()
+    await asyncio.gather(*[one(lesson_id) for lesson_id in lesson_ids])
+    wall = time.perf_counter() - began
+    stop.set()
+    await ticker
+
+    return {
+        "label": label,
+        "wall": wall,
+        # Sum of request latencies over wall time: ~1 when requests serialize
+        "overlap": sum(latencies) / wall,
+        "max_lag_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+async def run(args):
+    repo = LessonRepository()
+    plan = get_fallback_lesson_plan(GenerateRequest(
+        region="Benchmark", gradeBand="6-8", durationMinutes=60, topicPrompt="Photosynthesis benchmark"
+    ))
+
+    print(f"→ Seeding {args.lessons} lessons in the emulator at {os.getenv('FIRESTORE_EMULATOR_HOST')}")
+    docs = await asyncio.gather(*[
+        repo.create(OWNER, plan.region, plan.gradeBand, plan.durationMinutes, "benchmark", plan)
+        for _ in range(args.lessons)
+    ])
+    lesson_ids = [doc.id for doc in docs] * args.rounds
+
+    # What the repository did before: sync client calls inside async methods
+    sync_collection = firestore.Client(project=repo.pool.clients[0].project).collection(LessonRepository.COLLECTION)
+
+    async def blocking_read(lesson_id: str):
+        sync_collection.document(lesson_id).get()
+
+    async def async_read(lesson_id: str):
+        await repo.get_by_id(lesson_id, OWNER)
+
+    print(f"→ {len(lesson_ids)} reads, concurrency {args.concurrency}, "
+          f"pool of {len(repo.pool.clients)} channels")
+    results = [
+        await measure("blocking", blocking_read, lesson_ids, args.concurrency),
+        await measure("async", async_read, lesson_ids, args.concurrency),
+    ]
+
+    print(f"\n{'client':<10}{'wall s':>9}{'reads/s':>10}{'overlap':>9}{'max loop lag ms':>17}")
+    for result in results:
+        print(f"{result['label']:<10}{result['wall']:>9.2f}{len(lesson_ids) / result['wall']:>10.0f}"
+              f"{result['overlap']:>9.1f}{result['max_lag_ms']:>17.1f}")
+
+    print("\n→ Cleaning up")
+    await asyncio.gather(*[repo.delete(doc.id, OWNER) for doc in docs])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lessons", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=4, help="reads per lesson")
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark hedged image requests against plain ones, with simulated long-tailed provider latency."""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+# Keep benchmark images out of the real cache
+os.environ.setdefault("IMAGE_CACHE_DIR", tempfile.mkdtemp(prefix="bench_hedging_"))
+# Measure the provider's tail, not the default quota
+os.environ.setdefault("GEMINI_IMAGE_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("GEMINI_IMAGE_MAX_CONCURRENCY", "16")
+
+from app.services.image_generator import HedgingPolicy, ImageGenerator
+from app.services.provider_governor import GEMINI_IMAGE, get_provider_governor
+
+
+def install_fake_provider(generator: ImageGenerator, args, seed: int):
+    """Swap the Gemini call for a sleep drawn from a long-tailed distribution."""
+    rng = random.Random(seed)
+
+    def request(seconds: float) -> bytes:
+        # Blocks a thread like the real SDK, so abandoned hedges keep their slots
+        time.sleep(seconds)
+        return b"image"
+
+    async def request_image(enhanced_prompt: str):
+        seconds = rng.lognormvariate(0, 0.3) * args.image_seconds
+        if rng.random() < args.straggler_rate:
+            seconds *= args.straggler
+        return await get_provider_governor(GEMINI_IMAGE).call_blocking(lambda: request(seconds))
+
+    generator.client = object()
+    generator._request_image = request_image
+
+
+def percentile(ordered, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_jobs(generator: ImageGenerator, args) -> dict:
+    """Each job waits for its slowest slide, like a video job does."""
+    job_times = []
+    for job in range(args.jobs):
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            generator._request_hedged(f"prompt {job}-{slide}", slide) for slide in range(args.slides)
+        ])
+        job_times.append(time.perf_counter() - started)
+    job_times.sort()
+    return {
+        "p50": percentile(job_times, 0.5),
+        "p99": percentile(job_times, 0.99),
+        "stats": generator.hedging.stats(),
+    }
+
+
+async def run(args):
+    print(f"→ {args.jobs} jobs of {args.slides} slides, image ~{args.image_seconds}s, "
+          f"{args.straggler_rate:.0%} stragglers x{args.straggler}")
+    print(f"\n{'policy':<10}{'job p50 s':>11}{'job p99 s':>11}{'hedge rate':>12}{'hedge wins':>12}{'abandoned':>11}")
+    for enabled in (False, True):
+        generator = ImageGenerator()
+        generator.hedging = HedgingPolicy(enabled, args.percentile, args.max_hedges, min_samples=20)
+        # Same latency draws for both policies
+        install_fake_provider(generator, args, seed=42)
+        result = await run_jobs(generator, args)
+        stats = result["stats"]
+        print(f"{'hedged' if enabled else 'plain':<10}{result['p50']:>11.2f}{result['p99']:>11.2f}"
+              f"{stats['hedgeRate']:>12.1%}{stats['hedgeWins']:>12}{stats['abandoned']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--slides", type=int, default=6)
+    parser.add_argument("--image-seconds", type=float, default=0.2, help="median image latency")
+    parser.add_argument("--straggler-rate", type=float, default=0.05)
+    parser.add_argument("--straggler", type=float, default=6.0, help="latency multiplier for slow calls")
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--max-hedges", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent byte-range requests against the video stream route."""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# Keep benchmark output out of the real output directory
+os.environ.setdefault("VIDEO_OUTPUT_DIR", tempfile.mkdtemp(prefix="bench_media_"))
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse
+
+from app.routes.videos import router as videos_router
+from app.services.media_server import get_media_index
+from app.services.video_assembler import OUTPUT_DIR
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(videos_router, prefix="/api")
+
+    @app.get("/baseline/{video_id}")
+    async def baseline(video_id: str):
+        """The previous stream route: probe the disk, then FileResponse."""
+        video_path = os.path.join(OUTPUT_DIR, f"{video_id}.mp4")
+        if not os.path.exists(video_path):
+            raise HTTPException(status_code=404, detail="Video not found")
+        return FileResponse(video_path, media_type="video/mp4")
+
+    return app
+
+
+async def hammer(client: httpx.AsyncClient, url: str, size: int, args) -> dict:
+    """Fire args.requests random range requests, args.concurrency at a time."""
+    rng = random.Random(42)
+    latencies = []
+    statuses = {}
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        start = rng.randrange(0, size - args.range_kib * 1024)
+        end = start + args.range_kib * 1024 - 1
+        async with limit:
+            began = time.perf_counter()
+            response = await client.get(url, headers={"Range": f"bytes={start}-{end}"})
+            latencies.append(time.perf_counter() - began)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    began = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(args.requests)])
+    elapsed = time.perf_counter() - began
+    latencies.sort()
+    return {
+        "rps": args.requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "statuses": statuses,
+    }
+
+
+async def run(args):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(OUTPUT_DIR, "bench.mp4")
+    size = args.size_mib * 1024 * 1024
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    get_media_index().register(path)
+
+    print(f"→ {args.requests} requests of {args.range_kib} KiB ranges, "
+          f"concurrency {args.concurrency}, {args.size_mib} MiB file")
+    print("  (in-process ASGI transport: measures the chunked path, not sendfile)")
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Conditional revalidation cost
+        first = await client.get("/api/videos/bench/stream", headers={"Range": "bytes=0-0"})
+        etag = first.headers["etag"]
+        began = time.perf_counter()
+        for _ in range(args.requests):
+            response = await client.get("/api/videos/bench/stream", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+        revalidate_ms = (time.perf_counter() - began) / args.requests * 1000
+
+        print(f"\n{'route':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}  statuses")
+        for label, url in (("baseline", "/baseline/bench"), ("media", "/api/videos/bench/stream")):
+            result = await hammer(client, url, size, args)
+            print(f"{label:<12}{result['rps']:>10.0f}{result['p50']:>10.2f}{result['p95']:>10.2f}  {result['statuses']}")
+
+    print(f"\n304 revalidation: {revalidate_ms:.3f} ms/request")
+    print(f"index: {get_media_index().stats()}")
+    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--range-kib", type=int, default=256, help="bytes per range request")
+    parser.add_argument("--size-mib", type=int, default=64, help="size of the synthetic video")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark pipelined per-slide generation against gather-then-assemble, with simulated provider latency."""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+# Keep benchmark output out of the real output directory
+os.environ.setdefault("VIDEO_OUTPUT_DIR", tempfile.mkdtemp(prefix="bench_pipeline_"))
+
+from bench_assembly import synth_narration
+from app.models.video import Slide, VideoRequest, VideoScript
+from app.services.image_generator import get_image_generator
+from app.services.tts_generator import get_tts_generator
+from app.services.video_assembler import get_video_assembler
+from app.services.video_pipeline import _assemble_after_gather, _assemble_pipelined
+
+
+def install_fake_providers(args, seed: int):
+    """Swap the provider calls for placeholders returned after random delays."""
+    rng = random.Random(seed)
+    image_generator = get_image_generator()
+    tts_generator = get_tts_generator()
+    narrations = {}
+
+    def delay(mean: float) -> float:
+        # Long-tailed latency with one occasional straggler, as seen from real providers
+        seconds = rng.lognormvariate(0, 0.5) * mean
+        return seconds * args.straggler if rng.random() < 0.15 else seconds
+
+    async def generate_image(prompt: str, slide_number: int = 0):
+        await asyncio.sleep(delay(args.image_seconds))
+        return image_generator._generate_placeholder(prompt, slide_number)
+
+    async def generate_audio(text: str, voice_id=None):
+        await asyncio.sleep(delay(args.tts_seconds))
+        if text not in narrations:
+            narrations[text] = synth_narration(args.narration_seconds)
+        return narrations[text], args.narration_seconds
+
+    image_generator.generate_image = generate_image
+    tts_generator.generate_audio = generate_audio
+
+
+def build_script(count: int) -> VideoScript:
+    return VideoScript(
+        title="Benchmark",
+        slides=[
+            Slide(slideNumber=i + 1, title=f"Slide {i + 1}", narration=f"Narration {i}", imagePrompt=f"Prompt {i}")
+            for i in range(count)
+        ]
+    )
+
+
+async def run(args):
+    if not get_video_assembler().ffmpeg_available:
+        print("❌ ERROR: ffmpeg not found on PATH")
+        return
+
+    print(f"→ {args.slides} slides, image ~{args.image_seconds}s, TTS ~{args.tts_seconds}s, "
+          f"straggler x{args.straggler}, {args.narration_seconds}s narration")
+    script = build_script(args.slides)
+    request = VideoRequest(topic="bench", gradeBand="6-8", region="bench", slideCount=min(8, args.slides))
+
+    print(f"\n{'run':>4}{'barrier s':>12}{'pipelined s':>14}{'saved':>8}")
+    totals = {"barrier": 0.0, "pipelined": 0.0}
+    for run_index in range(args.repeat):
+        timings = {}
+        for label, assemble in (("barrier", _assemble_after_gather), ("pipelined", _assemble_pipelined)):
+            # Same latency draws for both strategies
+            install_fake_providers(args, seed=run_index)
+            start = time.perf_counter()
+            path, _ = await assemble(script, request, f"bench_{label}")
+            timings[label] = time.perf_counter() - start
+            totals[label] += timings[label]
+            if path:
+                os.remove(path)
+        saved = 1 - timings["pipelined"] / timings["barrier"]
+        print(f"{run_index + 1:>4}{timings['barrier']:>12.2f}{timings['pipelined']:>14.2f}{saved:>8.0%}")
+
+    print(f"\nmean: barrier {totals['barrier'] / args.repeat:.2f}s, "
+          f"pipelined {totals['pipelined'] / args.repeat:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=6)
+    parser.add_argument("--image-seconds", type=float, default=3.0, help="median image latency")
+    parser.add_argument("--tts-seconds", type=float, default=2.0, help="median TTS latency")
+    parser.add_argument("--straggler", type=float, default=3.0, help="latency multiplier for slow calls")
+    parser.add_argument("--narration-seconds", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
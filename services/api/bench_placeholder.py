@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized placeholder renderer against the original per-pixel loop."""
+import struct
+import time
+import zlib
+
+from app.services.image_generator import PLACEHOLDER_COLORS, render_placeholder_png
+
+
+def legacy_placeholder(slide_number: int) -> bytes:
+    """The original implementation: bytes appended one pixel at a time."""
+    color = PLACEHOLDER_COLORS[slide_number % len(PLACEHOLDER_COLORS)]
+    width, height = 640, 360
+
+    raw_data = b''
+    for y in range(height):
+        raw_data += b'\x00'
+        for x in range(width):
+            r = min(255, color[0] + (y // 8))
+            g = min(255, color[1] + (x // 15))
+            b = min(255, color[2] - (y // 10))
+            raw_data += bytes([max(0, r), max(0, g), max(0, b)])
+
+    compressed = zlib.compress(raw_data, 9)
+
+    def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+        chunk = chunk_type + data
+        crc = zlib.crc32(chunk) & 0xffffffff
+        return struct.pack('>I', len(data)) + chunk + struct.pack('>I', crc)
+
+    png = b'\x89PNG\r\n\x1a\n'
+    png += png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    png += png_chunk(b'IDAT', compressed)
+    png += png_chunk(b'IEND', b'')
+    return png
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print("→ Checking output matches the original renderer...")
+    for slide in range(len(PLACEHOLDER_COLORS)):
+        color = PLACEHOLDER_COLORS[slide]
+        assert render_placeholder_png.__wrapped__(color, 640, 360) == legacy_placeholder(slide)
+    print("✓ Byte-identical PNGs for all slide colors")
+
+    color = PLACEHOLDER_COLORS[0]
+    legacy_ms = timed(lambda: legacy_placeholder(0), repeat=3)
+    vector_ms = timed(lambda: render_placeholder_png.__wrapped__(color, 640, 360), repeat=10)
+    render_placeholder_png(color, 640, 360)
+    cached_ms = timed(lambda: render_placeholder_png(color, 640, 360), repeat=1000)
+
+    print(f"\n{'renderer':<28}{'ms / image':>12}{'speedup':>10}")
+    print(f"{'legacy loop 640x360':<28}{legacy_ms:>12.2f}{1:>9.0f}x")
+    print(f"{'numpy 640x360':<28}{vector_ms:>12.2f}{legacy_ms / vector_ms:>9.0f}x")
+    print(f"{'numpy 640x360 (memoized)':<28}{cached_ms:>12.4f}{legacy_ms / cached_ms:>9.0f}x")
+
+    for width, height in [(1280, 720), (1920, 1080)]:
+        ms = timed(lambda: render_placeholder_png.__wrapped__(color, width, height), repeat=5)
+        print(f"{f'numpy {width}x{height}':<28}{ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Benchmark encoding profiles: encode time and output size on placeholder slides."""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+# Keep benchmark output out of the real output directory
+os.environ.setdefault("VIDEO_OUTPUT_DIR", tempfile.mkdtemp(prefix="bench_profiles_"))
+
+from bench_assembly import build_slides
+from app.services.video_assembler import ASSEMBLY_MODES, ENCODING_PROFILES, get_video_assembler
+
+
+async def run(args):
+    assembler = get_video_assembler()
+    if not assembler.ffmpeg_available:
+        print("❌ ERROR: ffmpeg not found on PATH")
+        return
+
+    print(f"→ {args.slides} slides x {args.seconds}s, mode {args.mode}")
+    slides = build_slides(args.slides, args.seconds)
+    video_seconds = args.slides * args.seconds
+
+    print(f"\n{'profile':<10}{'preset':<11}{'crf':>4}{'fps':>5}{'gop':>5}"
+          f"{'encode s':>10}{'x realtime':>12}{'size KiB':>10}{'kbit/s':>9}")
+    for name, profile in ENCODING_PROFILES.items():
+        best = float("inf")
+        size = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            path = await assembler.assemble_video(slides, f"bench_{name}.mp4", mode=args.mode, profile=name)
+            elapsed = time.perf_counter() - start
+            if path is None:
+                print(f"❌ {name} failed")
+                break
+            best = min(best, elapsed)
+            size = os.path.getsize(path)
+            os.remove(path)
+
+        kbps = size * 8 / 1000 / video_seconds
+        print(f"{name:<10}{profile.preset:<11}{profile.crf:>4}{profile.fps:>5}{profile.gop_seconds:>5g}"
+              f"{best:>10.2f}{video_seconds / best:>12.1f}{size / 1024:>10.0f}{kbps:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=15.0, help="narration length per slide")
+    parser.add_argument("--mode", choices=ASSEMBLY_MODES, default="single_pass")
+    parser.add_argument("--repeat", type=int, default=2, help="best of N runs per profile")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
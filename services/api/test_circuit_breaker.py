@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Test that circuit breakers ignore outcomes of calls admitted before a state change."""
+import asyncio
+import threading
+
+from app.services.circuit_breaker import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+)
+from app.services.provider_governor import ProviderGovernor
+
+
+class ProviderError(Exception):
+    pass
+
+
+async def fail(breaker: CircuitBreaker):
+    try:
+        async with breaker.guard():
+            raise ProviderError()
+    except ProviderError:
+        pass
+
+
+def test_stale_success_does_not_close_tripped_breaker():
+    async def run():
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_seconds=60)
+        slow_call_started = asyncio.Event()
+        finish_slow_call = asyncio.Event()
+
+        async def slow_call():
+            async with breaker.guard():
+                slow_call_started.set()
+                await finish_slow_call.wait()
+
+        slow = asyncio.create_task(slow_call())
+        await slow_call_started.wait()
+        await fail(breaker)
+        await fail(breaker)
+        assert breaker.state == CIRCUIT_OPEN
+
+        # Admitted while closed, finishes after the trip
+        finish_slow_call.set()
+        await slow
+        assert breaker.state == CIRCUIT_OPEN
+
+    asyncio.run(run())
+
+
+def test_stale_failure_does_not_end_half_open_trial():
+    async def run():
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_seconds=0)
+        slow_call_started = asyncio.Event()
+        finish_slow_call = asyncio.Event()
+        trial_started = asyncio.Event()
+        finish_trial = asyncio.Event()
+
+        async def slow_call():
+            async with breaker.guard():
+                slow_call_started.set()
+                await finish_slow_call.wait()
+                raise ProviderError()
+
+        async def trial():
+            async with breaker.guard():
+                trial_started.set()
+                await finish_trial.wait()
+
+        slow = asyncio.create_task(slow_call())
+        await slow_call_started.wait()
+        await fail(breaker)
+        assert breaker.state == CIRCUIT_OPEN
+
+        probe = asyncio.create_task(trial())
+        await trial_started.wait()
+        assert breaker.state == CIRCUIT_HALF_OPEN
+
+        # Admitted while closed, fails during the trial
+        finish_slow_call.set()
+        try:
+            await slow
+        except ProviderError:
+            pass
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert breaker._trial_running
+
+        finish_trial.set()
+        await probe
+        assert breaker.state == CIRCUIT_CLOSED
+
+    asyncio.run(run())
+
+
+def test_timed_out_blocking_call_keeps_its_slot():
+    async def run():
+        governor = ProviderGovernor("test", max_concurrency=1, requests_per_minute=0)
+        release = threading.Event()
+        try:
+            await governor.call_blocking(release.wait, timeout=0.05)
+            assert False, "expected a timeout"
+        except asyncio.TimeoutError:
+            pass
+        # The thread is still running, so the only slot is still taken
+        assert governor.in_flight == 1 and governor.abandoned == 1
+
+        release.set()
+        assert await governor.call_blocking(lambda: "done", timeout=1) == "done"
+        assert governor.in_flight == 0
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for test in (
+        test_stale_success_does_not_close_tripped_breaker,
+        test_stale_failure_does_not_end_half_open_trial,
+        test_timed_out_blocking_call_keeps_its_slot,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ Circuit breaker tests passed")